@@ -0,0 +1,54 @@
+"""Signing-input serialization: json.dumps(sort_keys=True) vs. CanonicalEncoder.
+
+    python benchmarks/bench_canonical.py --records 200000
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.canonical import CanonicalEncoder
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    meter_data = MeterData(
+        meter_name="300016966",
+        meter_data={"kwh": 100, "kvarh": 12.5, "pulse_count": [1, 2, 3]},
+        meter_day_of_week="Monday",
+        reading_date="2026-02-09",
+        model="Pulse v.4",
+        address="123 Main St",
+        firmware="1.0.0",
+        total_watt_hour=1234567.8,
+        voltage=120.3,
+        amps=10.25,
+        total_power_watts=1233.1,
+        ct_ratio=200.0,
+        frequency_hz=59.98,
+    )
+    encoder = CanonicalEncoder()
+    assert encoder.encode(meter_data) == json.dumps(meter_data.__dict__, sort_keys=True).encode("utf-8")
+
+    started = time.perf_counter()
+    for _ in range(args.records):
+        hashlib.sha256(json.dumps(meter_data.__dict__, sort_keys=True).encode("utf-8")).digest()
+    legacy = (time.perf_counter() - started) / args.records
+
+    started = time.perf_counter()
+    for _ in range(args.records):
+        encoder.digest(meter_data)
+    canonical = (time.perf_counter() - started) / args.records
+
+    print(f"json.dumps + sha256       {legacy * 1e6:6.2f} us/record")
+    print(f"CanonicalEncoder.digest   {canonical * 1e6:6.2f} us/record ({legacy / canonical:.2f}x)")
+
+if __name__ == "__main__":
+    main()
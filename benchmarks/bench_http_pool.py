@@ -0,0 +1,151 @@
+"""Per-cycle latency of fresh connections vs. a pooled keep-alive session.
+
+Runs fetch + ingest cycles against a local HTTPS stub with and without the
+shared session created by ``ekm_meter.utils.http.create_session``.
+
+    python benchmarks/bench_http_pool.py --cycles 200
+"""
+import argparse
+import datetime
+import json
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+METER_REPLY = json.dumps({
+    "meter_name": "300016966",
+    "meter_data": {"kwh": 100},
+    "meter_day_of_week": "Monday",
+    "reading_date": "2026-02-09",
+    "model": "Pulse v.4",
+    "address": "123 Main St",
+    "firmware": "1.0.0",
+    "total_watt_hour": 1000.0,
+    "voltage": 120.0,
+    "amps": 10.0,
+    "total_power_watts": 1200.0,
+    "ct_ratio": 1.0,
+    "frequency_hz": 60.0,
+}).encode("utf-8")
+INGEST_REPLY = json.dumps({"result": "success"}).encode("utf-8")
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(METER_REPLY)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(INGEST_REPLY)
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def write_self_signed_cert(directory: str):
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    import ipaddress
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+def start_https_stub(cert_path: str, key_path: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_cycles(ekm_repo, ingestion_service, cycles: int):
+    latencies = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        ekm_repo.fetch_meter_data()
+        ingestion_service.ingest("00" * 256)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def report(label: str, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:<10} mean {statistics.mean(latencies) * 1000:7.2f} ms  "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms"
+    )
+    return statistics.mean(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = write_self_signed_cert(directory)
+        server = start_https_stub(cert_path, key_path)
+        base_url = f"https://127.0.0.1:{server.server_address[1]}"
+        os.environ.update({
+            "EKM_API_URL": base_url,
+            "EKM_METER_NUMBER": "300016966",
+            "EKM_API_KEY": "benchmark",
+            "CLOUD_INGEST_URL": f"{base_url}/ingest",
+            "PRIVATE_KEY_PATH": key_path,
+            "REQUESTS_CA_BUNDLE": cert_path,
+        })
+
+        from ekm_meter.repository.ekm_api import EKMAPIRepository
+        from ekm_meter.service.ingestion import CloudIngestionService
+        from ekm_meter.utils.http import create_session
+
+        fresh = report("fresh", run_cycles(EKMAPIRepository(), CloudIngestionService(), args.cycles))
+        session = create_session()
+        try:
+            pooled = report("pooled", run_cycles(EKMAPIRepository(session), CloudIngestionService(session), args.cycles))
+        finally:
+            session.close()
+            server.shutdown()
+        print(f"per-cycle latency reduction: {(1 - pooled / fresh) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
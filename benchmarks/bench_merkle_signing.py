@@ -0,0 +1,84 @@
+"""Records per second: one signature per reading vs. one per Merkle batch.
+
+    python benchmarks/bench_merkle_signing.py --records 2000 --batch-size 1024
+"""
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def write_rsa_key(directory: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = os.path.join(directory, "private_key.pem")
+    with open(path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update({
+            "EKM_API_URL": "http://127.0.0.1",
+            "EKM_METER_NUMBER": "300016966",
+            "EKM_API_KEY": "benchmark",
+            "CLOUD_INGEST_URL": "http://127.0.0.1/ingest",
+            "PRIVATE_KEY_PATH": write_rsa_key(directory),
+        })
+        from ekm_meter.domain.models import MeterData
+        from ekm_meter.service.hashing import HashingService, verify_batch_record
+
+        template = MeterData(
+            meter_name="300016966",
+            meter_data={"kwh": 100},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0,
+        )
+        records = [dataclasses.replace(template, total_watt_hour=1000.0 + n) for n in range(args.records)]
+        hashing_service = HashingService()
+
+        started = time.perf_counter()
+        for meter_data in records:
+            hashing_service.hash_meter_data(meter_data)
+        per_record = args.records / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        proofs = []
+        for start in range(0, args.records, args.batch_size):
+            proofs.extend(hashing_service.hash_meter_batch(records[start:start + args.batch_size]))
+        merkle = args.records / (time.perf_counter() - started)
+
+        public_key = hashing_service.private_key.public_key()
+        started = time.perf_counter()
+        assert all(verify_batch_record(public_key, meter_data, proof) for meter_data, proof in zip(records, proofs))
+        verify = args.records / (time.perf_counter() - started)
+
+        print(f"per-record signing   {per_record:12,.0f} records/s")
+        print(f"merkle batch signing {merkle:12,.0f} records/s (batch size {args.batch_size}, {merkle / per_record:.0f}x)")
+        print(f"proof verification   {verify:12,.0f} records/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Memory footprint of 1M readings as MeterData, SlottedMeterData and MeterBatch.
+
+    python benchmarks/bench_meter_memory.py --records 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ekm_meter.domain.models import MeterBatch, MeterData, SlottedMeterData
+
+MODELS = ("Pulse v.4", "Omnimeter I v.3", "Omnimeter II UL v.4")
+FIRMWARE = ("1.0.0", "1.0.1", "1.1.0")
+
+def readings(count: int, record_type=MeterData):
+    for n in range(count):
+        meter = n % 2000
+        # Strings arrive from JSON parsing as fresh objects, so each reading owns its own copies
+        yield record_type(
+            meter_name="".join(("3000", str(meter))),
+            meter_data=None,
+            meter_day_of_week="".join(("Mon", "day")),
+            reading_date=f"2026-02-09T{n % 24:02d}:{n % 60:02d}:00",
+            model="".join(MODELS[meter % 3]),
+            address="".join(("Site ", str(meter))),
+            firmware="".join(FIRMWARE[meter % 3]),
+            total_watt_hour=1000.0 + n,
+            voltage=120.0 + (n % 7) / 10,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=200.0,
+            frequency_hz=60.0,
+        )
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {
+        "list[MeterData]": measure(lambda: list(readings(args.records))),
+        "list[SlottedMeterData]": measure(lambda: list(readings(args.records, SlottedMeterData))),
+        "MeterBatch": measure(lambda: MeterBatch.from_records(readings(args.records))),
+    }
+    baseline = results["list[MeterData]"]
+    for label, size in results.items():
+        print(f"{label:<24} {size / 2**20:8.1f} MiB  {size / args.records:6.0f} B/reading  {baseline / size:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Signatures per second and upload bytes per record for each supported key type.
+
+    python benchmarks/bench_signing_keys.py --records 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def generate_keys():
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    return {
+        "RSA-2048": rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        "ECDSA P-256": ec.generate_private_key(ec.SECP256R1()),
+        "Ed25519": ed25519.Ed25519PrivateKey.generate(),
+    }
+
+def write_key(directory: str, label: str, private_key) -> str:
+    from cryptography.hazmat.primitives import serialization
+
+    path = os.path.join(directory, label.replace(" ", "_") + ".pem")
+    with open(path, "wb") as f:
+        f.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {label: write_key(directory, label, key) for label, key in generate_keys().items()}
+        os.environ.update({
+            "EKM_API_URL": "http://127.0.0.1",
+            "EKM_METER_NUMBER": "300016966",
+            "EKM_API_KEY": "benchmark",
+            "CLOUD_INGEST_URL": "http://127.0.0.1/ingest",
+            "PRIVATE_KEY_PATH": paths["RSA-2048"],
+        })
+        from ekm_meter.config.settings import settings
+        from ekm_meter.domain.models import MeterData
+        from ekm_meter.service.hashing import HashingService
+
+        meter_data = MeterData(
+            meter_name="300016966",
+            meter_data={"kwh": 100},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0,
+        )
+        print(f"{'key':<12} {'scheme':<24} {'signatures/s':>14} {'bytes/record':>13}")
+        for label, path in paths.items():
+            settings.PRIVATE_KEY_PATH = path
+            hashing_service = HashingService()
+            started = time.perf_counter()
+            for _ in range(args.records):
+                hashed_data = hashing_service.hash_meter_data(meter_data)
+            rate = args.records / (time.perf_counter() - started)
+            # hashed_data travels hex-encoded, so every signature byte costs two on the wire
+            print(f"{label:<12} {hashing_service.signature_scheme:<24} {rate:14,.0f} {len(hashed_data):13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Append and replay throughput of the durable ingestion spool.
+
+Appends N signed records with batched fsync, then drains them through a
+no-op sink at an unlimited replay rate, compacting segments as they are
+acknowledged.
+
+    python benchmarks/bench_spool_replay.py --records 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name, value in {
+    "EKM_API_URL": "http://127.0.0.1",
+    "EKM_METER_NUMBER": "300016966",
+    "EKM_API_KEY": "benchmark",
+    "CLOUD_INGEST_URL": "http://127.0.0.1/ingest",
+    "PRIVATE_KEY_PATH": "unused.pem",
+}.items():
+    os.environ.setdefault(name, value)
+
+from ekm_meter.repository.spool import Spool, SpoolReplayer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--fsync-records", type=int, default=1000)
+    parser.add_argument("--segment-bytes", type=int, default=64 * 1024 * 1024)
+    args = parser.parse_args()
+
+    record = {"meter_number": "300016966", "hashed_data": "ab" * 256}
+    with tempfile.TemporaryDirectory() as directory:
+        spool = Spool(directory, segment_max_bytes=args.segment_bytes, fsync_records=args.fsync_records, fsync_seconds=1.0)
+
+        started = time.perf_counter()
+        for _ in range(args.records):
+            spool.append(record)
+        spool.sync()
+        append_seconds = time.perf_counter() - started
+        segments = len(spool.segments)
+
+        replayer = SpoolReplayer(spool, lambda records: [True] * len(records), rate_per_second=0, batch_size=args.batch_size)
+        started = time.perf_counter()
+        replayed = replayer.drain()
+        replay_seconds = time.perf_counter() - started
+        spool.close()
+
+        print(f"records          {args.records}")
+        print(f"append           {args.records / append_seconds:12,.0f} records/s ({append_seconds:.2f}s)")
+        print(f"replay + compact {replayed / replay_seconds:12,.0f} records/s ({replay_seconds:.2f}s)")
+        print(f"segments         {segments} written, {len(spool.segments)} left after compaction")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""End-to-end controller throughput against the EKM simulator and a fake ingest server.
+
+Each meter count runs one real controller cycle in its own worker process, so
+CPU time and peak RSS belong to that run alone. Results are written as JSON so
+runs can be compared between commits.
+
+    python benchmarks/bench_suite.py --meters 1 100 10000 --mode pipeline --output bench_results.json
+"""
+import argparse
+import gzip
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+STAGES = {
+    "fetch": "ekm_fetch_seconds",
+    "serialize": "ekm_serialize_seconds",
+    "sign": "ekm_sign_seconds",
+    "ingest": "ekm_ingest_seconds",
+}
+PERCENTILES = (0.5, 0.9, 0.99)
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under a 32-way fetch stage and stalls on retransmits
+    request_queue_size = 1024
+
+    def __init__(self, handler, latency_seconds: float, error_rate: float, seed: int):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.records = 0
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = self.random.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def reply(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def delay_or_fail(self) -> bool:
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+        if self.server.should_fail():
+            self.reply(503, {"error": "injected failure"})
+            return True
+        return False
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeIngestHandler(FakeHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.delay_or_fail():
+            return
+        if not self.path.endswith("/batch"):
+            with self.server.lock:
+                self.server.records += 1
+            self.reply(200, {"result": "success"})
+            return
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        records = json.loads(body)["records"]
+        with self.server.lock:
+            self.server.records += len(records)
+        self.reply(200, {"acks": [{"id": record["id"], "status": "ok"} for record in records]})
+
+def start_server(handler, latency_ms: float, error_rate: float, seed: int) -> FakeServer:
+    server = FakeServer(handler, latency_ms / 1000, error_rate, seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def write_rsa_key(directory: str) -> str:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = os.path.join(directory, "private_key.pem")
+    with open(path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return path
+
+def histogram_counts(histogram):
+    # Labelled histograms (ingest by endpoint) are merged across their children
+    children = list(histogram.children.values()) if histogram.labelnames else [histogram]
+    counts = [sum(column) for column in zip(*(child.counts for child in children))] if children else []
+    return histogram.buckets, counts
+
+def histogram_quantile(buckets, counts, q: float):
+    # Linear interpolation inside the bucket, as Prometheus' histogram_quantile does
+    total = sum(counts)
+    if not total:
+        return None
+    rank, cumulative, lower = q * total, 0, 0.0
+    for upper, count in zip(buckets + (float("inf"),), counts):
+        if count and cumulative + count >= rank:
+            if upper == float("inf"):
+                return lower
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+        lower = upper
+    return lower
+
+def run_worker(mode: str, result_path: str):
+    from ekm_meter.controller import main as controller
+    from ekm_meter.utils.metrics import REGISTRY
+
+    run = {
+        "single": controller.run_extraction_cycle,
+        "fleet": controller.run_fleet_extraction_cycle,
+        "pipeline": controller.run_pipeline_extraction_cycle,
+    }[mode]
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    run(max_cycles=1)
+    after = resource.getrusage(resource.RUSAGE_SELF)
+
+    stages = {}
+    for stage, name in STAGES.items():
+        buckets, counts = histogram_counts(REGISTRY.metrics[name])
+        stages[stage] = {"count": sum(counts)}
+        for q in PERCENTILES:
+            value = histogram_quantile(buckets, counts, q)
+            stages[stage][f"p{int(q * 100)}_ms"] = None if value is None else value * 1000
+    cycle = REGISTRY.metrics["ekm_cycle_seconds"]
+    with open(result_path, "w") as f:
+        json.dump({
+            "cycle_seconds": sum(child.sum for child in cycle.children.values()),
+            "cpu_seconds": (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime),
+            # ru_maxrss is in KiB on Linux
+            "peak_rss_mib": after.ru_maxrss / 1024,
+            "stages": stages,
+        }, f)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meters", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--mode", choices=["single", "fleet", "pipeline"], default="pipeline")
+    parser.add_argument("--ekm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--ekm-error-rate", type=float, default=0.0)
+    parser.add_argument("--ekm-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--ekm-malformed-rate", type=float, default=0.0)
+    parser.add_argument("--ingest-latency-ms", type=float, default=0.0)
+    parser.add_argument("--ingest-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.mode, args.worker)
+        return
+
+    from ekm_meter.simulator.meters import MeterSimulator
+    from ekm_meter.simulator.server import FaultInjector, SimulatorServer
+
+    ekm_server = SimulatorServer(
+        ("127.0.0.1", 0),
+        MeterSimulator(args.seed, max(args.meters)),
+        FaultInjector(
+            args.seed,
+            throttle_rate=args.ekm_throttle_rate,
+            server_error_rate=args.ekm_error_rate,
+            malformed_rate=args.ekm_malformed_rate,
+        ),
+        args.ekm_latency_ms / 1000,
+    ).start()
+    ingest_server = start_server(FakeIngestHandler, args.ingest_latency_ms, args.ingest_error_rate, args.seed + 1)
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        key_path = write_rsa_key(directory)
+        for meters in args.meters:
+            meter_numbers = [str(300000000 + n) for n in range(meters)]
+            env = dict(
+                os.environ,
+                EKM_API_URL=ekm_server.url,
+                EKM_METER_NUMBER=meter_numbers[0],
+                EKM_METER_NUMBERS=",".join(meter_numbers),
+                EKM_API_KEY="benchmark",
+                CLOUD_INGEST_URL=f"http://127.0.0.1:{ingest_server.server_address[1]}/ingest",
+                PRIVATE_KEY_PATH=key_path,
+                EXTRACTION_MODE=args.mode,
+                EXTRACTION_INTERVAL_SECONDS="1",
+            )
+            result_path = os.path.join(directory, f"result-{meters}.json")
+            ingested_before = ingest_server.records
+            worker = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", result_path, "--mode", args.mode],
+                env=env, capture_output=True, text=True,
+            )
+            if worker.returncode != 0:
+                sys.stderr.write(worker.stdout + worker.stderr)
+                raise SystemExit(f"Benchmark worker failed for {meters} meters")
+            with open(result_path) as f:
+                result = json.load(f)
+            result["meters"] = meters
+            result["records_ingested"] = ingest_server.records - ingested_before
+            result["records_per_second"] = result["records_ingested"] / max(result["cycle_seconds"], 1e-9)
+            runs.append(result)
+            print(
+                f"{meters:>7} meters  {result['records_per_second']:10,.0f} records/s  "
+                f"cycle {result['cycle_seconds']:7.2f}s  cpu {result['cpu_seconds']:7.2f}s  "
+                f"rss {result['peak_rss_mib']:6.1f} MiB"
+            )
+            for stage, stats in result["stages"].items():
+                if stats["count"]:
+                    print(
+                        f"{'':>9}{stage:<10} n={stats['count']:<7} p50 {stats['p50_ms']:8.2f} ms  "
+                        f"p90 {stats['p90_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+                    )
+    ekm_server.shutdown()
+    ingest_server.shutdown()
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "mode": args.mode,
+            "config": {
+                "ekm_latency_ms": args.ekm_latency_ms,
+                "ekm_error_rate": args.ekm_error_rate,
+                "ekm_throttle_rate": args.ekm_throttle_rate,
+                "ekm_malformed_rate": args.ekm_malformed_rate,
+                "ingest_latency_ms": args.ingest_latency_ms,
+                "ingest_error_rate": args.ingest_error_rate,
+                "seed": args.seed,
+            },
+            "ekm": ekm_server.stats.snapshot(),
+            "ingest_requests": ingest_server.requests,
+            "ingest_errors": ingest_server.errors,
+            "runs": runs,
+        }, f, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Range queries over the local time-series store: indexed seeks vs. a full scan.
+
+Writes --days of one-minute readings for one meter, then reads one day from
+the middle through the timestamp index and by decoding every stored row.
+Also times one fleet cycle's worth of appends (one reading per meter, one flush).
+
+    python benchmarks/bench_timeseries.py --days 90 --meters 10000
+"""
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name, value in {
+    "EKM_API_URL": "http://127.0.0.1",
+    "EKM_METER_NUMBER": "300016966",
+    "EKM_API_KEY": "benchmark",
+    "CLOUD_INGEST_URL": "http://127.0.0.1/ingest",
+    "PRIVATE_KEY_PATH": "unused.pem",
+}.items():
+    os.environ.setdefault(name, value)
+
+from ekm_meter.domain.models import MeterData
+from ekm_meter.repository.timeseries import TimeSeriesStore
+from ekm_meter.simulator.meters import MeterSimulator
+
+START = 1_767_225_600
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--meters", type=int, default=10000)
+    args = parser.parse_args()
+
+    simulator = MeterSimulator(meter_count=max(args.meters, 1))
+    meter_number = simulator.meter_numbers[0]
+    template = _meter_data(simulator.reading(meter_number, START))
+    minutes = args.days * 1440
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = TimeSeriesStore(directory, flush_rows=4096)
+        started = time.perf_counter()
+        for minute in range(minutes):
+            reading = dataclasses.replace(template, total_watt_hour=template.total_watt_hour + minute)
+            store.append(meter_number, reading, START + 60 * minute)
+        store.flush()
+        elapsed = time.perf_counter() - started
+        print(f"append      {minutes} readings in {elapsed:.2f}s ({minutes / elapsed:,.0f}/s)")
+        size = sum(os.path.getsize(os.path.join(directory, meter_number, name)) for name in os.listdir(os.path.join(directory, meter_number)))
+        print(f"on disk     {size / minutes:.1f} bytes/reading")
+
+        day_start = START + 86400 * (args.days // 2)
+        started = time.perf_counter()
+        indexed = list(store.query(meter_number, day_start, day_start + 86400))
+        indexed_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        column = store.column(meter_number, "total_watt_hour", day_start, day_start + 86400)
+        column_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        scanned = [row for row in store.query(meter_number) if day_start <= row[0] < day_start + 86400]
+        scan_seconds = time.perf_counter() - started
+        assert indexed == scanned and len(column) == len(indexed) == 1440
+        print(f"one day     indexed query {indexed_seconds * 1000:8.2f} ms")
+        print(f"            one column    {column_seconds * 1000:8.2f} ms")
+        print(f"            full scan     {scan_seconds * 1000:8.2f} ms ({scan_seconds / indexed_seconds:.0f}x slower)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = TimeSeriesStore(directory)
+        readings = [(number, _meter_data(simulator.reading(number, START))) for number in simulator.meter_numbers[:args.meters]]
+        for cycle in range(2):
+            started = time.perf_counter()
+            for number, reading in readings:
+                store.append(number, reading, START + 60 * cycle)
+            store.flush()
+            label = "first cycle" if cycle == 0 else "next cycle"
+            print(f"{label:<11} {args.meters} meters appended and flushed in {time.perf_counter() - started:.2f}s")
+
+def _meter_data(reply):
+    return MeterData(**{name: reply[name] for name in MeterData.__dataclass_fields__})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from ekm_meter.config.settings import Settings, settings
+
+class ConfigWatcher:
+    def __init__(self, env_path: str = ".env", key_path: Optional[str] = None):
+        self.env_path = env_path
+        self.key_path = key_path if key_path is not None else settings.PRIVATE_KEY_PATH
+        self.requested = threading.Event()
+        self.stop_callback: Optional[Callable[[], None]] = None
+        self.snapshot = self._stat()
+        # Key path named by the last load, and the files as they were when that load was rejected
+        self.candidate_key_path = self.key_path
+        self.rejected: Optional[Dict[str, Optional[Tuple[int, int, int]]]] = None
+
+    def attach(self, stop_callback: Optional[Callable[[], None]]):
+        # The running controller registers how to end its schedule once a reload is due
+        self.stop_callback = stop_callback
+
+    def request_reload(self):
+        self.requested.set()
+        if self.stop_callback:
+            self.stop_callback()
+
+    def changed(self) -> bool:
+        if self.requested.is_set():
+            return True
+        if self.rejected is not None:
+            # Retry only once the files that failed have changed again
+            return self._stat(self.candidate_key_path) != self.rejected
+        return self._stat() != self.snapshot
+
+    def check(self) -> bool:
+        if self.changed():
+            self.request_reload()
+            return True
+        return False
+
+    def load(self) -> Settings:
+        from dotenv import dotenv_values
+
+        # Values in the file win over the process environment, which still holds what the first load copied in
+        environ = dict(os.environ)
+        if os.path.exists(self.env_path):
+            environ.update({name: value for name, value in dotenv_values(self.env_path).items() if value is not None})
+        self.candidate_key_path = environ.get("PRIVATE_KEY_PATH") or self.key_path
+        return Settings(environ=environ)
+
+    def accept(self, key_path: Optional[str] = None):
+        # Called once the loaded settings and key have been validated
+        if key_path:
+            self.key_path = key_path
+        self.snapshot = self._stat()
+        self.rejected = None
+        self.requested.clear()
+
+    def reject(self):
+        self.rejected = self._stat(self.candidate_key_path)
+        self.requested.clear()
+
+    def _stat(self, key_path: Optional[str] = None) -> Dict[str, Optional[Tuple[int, int, int]]]:
+        snapshot = {}
+        for path in (self.env_path, key_path or self.key_path):
+            if not path:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                snapshot[path] = None
+                continue
+            # Inode too: key rotation usually renames a new file into place
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return snapshot
\ No newline at end of file
@@ -1,15 +1,93 @@
 import os
-from dotenv import load_dotenv
+import threading
+from typing import Any, Mapping, Optional
 
 class Settings:
-    def __init__(self, env_path: str = ".env"):
-        load_dotenv(env_path)
-        self.EKM_API_URL = os.getenv("EKM_API_URL")
-        self.EKM_METER_NUMBER = os.getenv("EKM_METER_NUMBER")
-        self.EKM_API_KEY = os.getenv("EKM_API_KEY")
-        self.CLOUD_INGEST_URL = os.getenv("CLOUD_INGEST_URL")
-        self.PRIVATE_KEY_PATH = os.getenv("PRIVATE_KEY_PATH")
-        self.EXTRACTION_INTERVAL_SECONDS = int(os.getenv("EXTRACTION_INTERVAL_SECONDS", "60"))
+    def __init__(self, env_path: str = ".env", environ: Optional[Mapping[str, str]] = None):
+        # An explicit mapping skips .env and the process environment entirely (tests, reloads)
+        if environ is None:
+            from dotenv import load_dotenv
+
+            load_dotenv(env_path)
+            environ = os.environ
+        getenv = environ.get
+        self.EKM_API_URL = getenv("EKM_API_URL")
+        self.EKM_METER_NUMBER = getenv("EKM_METER_NUMBER")
+        self.EKM_API_KEY = getenv("EKM_API_KEY")
+        self.CLOUD_INGEST_URL = getenv("CLOUD_INGEST_URL")
+        self.PRIVATE_KEY_PATH = getenv("PRIVATE_KEY_PATH")
+        self.EXTRACTION_INTERVAL_SECONDS = int(getenv("EXTRACTION_INTERVAL_SECONDS", "60"))
+        self.EXTRACTION_MODE = getenv("EXTRACTION_MODE", "single")
+        self.SCHEDULER_OVERLAP_POLICY = getenv("SCHEDULER_OVERLAP_POLICY", "skip")
+        self.SCHEDULER_JITTER_SECONDS = float(getenv("SCHEDULER_JITTER_SECONDS", "0"))
+        self.EKM_METER_NUMBERS = [
+            number.strip()
+            for number in getenv("EKM_METER_NUMBERS", self.EKM_METER_NUMBER or "").split(",")
+            if number.strip()
+        ]
+        if not self.EKM_METER_NUMBER and self.EKM_METER_NUMBERS:
+            self.EKM_METER_NUMBER = self.EKM_METER_NUMBERS[0]
+        self.FLEET_CONCURRENCY = int(getenv("FLEET_CONCURRENCY", "100"))
+        self.EKM_BATCH_SIZE = int(getenv("EKM_BATCH_SIZE", "1"))
+        self.PIPELINE_FETCH_WORKERS = int(getenv("PIPELINE_FETCH_WORKERS", "32"))
+        self.PIPELINE_SIGN_WORKERS = int(getenv("PIPELINE_SIGN_WORKERS", "2"))
+        self.PIPELINE_INGEST_WORKERS = int(getenv("PIPELINE_INGEST_WORKERS", "8"))
+        self.PIPELINE_QUEUE_SIZE = int(getenv("PIPELINE_QUEUE_SIZE", "100"))
+        self.HTTP_POOL_CONNECTIONS = int(getenv("HTTP_POOL_CONNECTIONS", "10"))
+        self.HTTP_POOL_MAXSIZE = int(getenv("HTTP_POOL_MAXSIZE", "100"))
+        self.CLOUD_INGEST_BATCH_URL = getenv("CLOUD_INGEST_BATCH_URL") or f"{self.CLOUD_INGEST_URL}/batch"
+        self.INGEST_BATCHING = getenv("INGEST_BATCHING", "false").lower() == "true"
+        self.INGEST_BATCH_MAX_RECORDS = int(getenv("INGEST_BATCH_MAX_RECORDS", "500"))
+        self.INGEST_BATCH_MAX_BYTES = int(getenv("INGEST_BATCH_MAX_BYTES", "1000000"))
+        self.INGEST_BATCH_LINGER_SECONDS = float(getenv("INGEST_BATCH_LINGER_SECONDS", "5"))
+        self.INGEST_COMPRESSION = getenv("INGEST_COMPRESSION", "gzip")
+        self.SIGNING_MODE = getenv("SIGNING_MODE", "record")
+        self.MERKLE_BATCH_SIZE = int(getenv("MERKLE_BATCH_SIZE", "1024"))
+        self.SIGNER_WORKERS = int(getenv("SIGNER_WORKERS", "0"))
+        self.SIGNER_CHUNK_SIZE = int(getenv("SIGNER_CHUNK_SIZE", "64"))
+        self.DEDUP_ENABLED = getenv("DEDUP_ENABLED", "false").lower() == "true"
+        self.DEDUP_MODE = getenv("DEDUP_MODE", "suppress")
+        self.DEDUP_MAX_METERS = int(getenv("DEDUP_MAX_METERS", "100000"))
+        self.DEDUP_IGNORE_FIELDS = [
+            name.strip() for name in getenv("DEDUP_IGNORE_FIELDS", "reading_date,meter_day_of_week").split(",") if name.strip()
+        ]
+        self.SPOOL_DIR = getenv("SPOOL_DIR")
+        self.SPOOL_SEGMENT_BYTES = int(getenv("SPOOL_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+        self.SPOOL_FSYNC_RECORDS = int(getenv("SPOOL_FSYNC_RECORDS", "100"))
+        self.SPOOL_FSYNC_SECONDS = float(getenv("SPOOL_FSYNC_SECONDS", "1"))
+        self.SPOOL_REPLAY_RATE = float(getenv("SPOOL_REPLAY_RATE", "200"))
+        self.SPOOL_REPLAY_BATCH_SIZE = int(getenv("SPOOL_REPLAY_BATCH_SIZE", "100"))
+        self.STORE_DIR = getenv("STORE_DIR")
+        self.STORE_FLUSH_SECONDS = float(getenv("STORE_FLUSH_SECONDS", "0"))
+        self.BACKFILL_WORKERS = int(getenv("BACKFILL_WORKERS", "8"))
+        self.BACKFILL_READS_PER_REQUEST = int(getenv("BACKFILL_READS_PER_REQUEST", "1000"))
+        self.BACKFILL_READ_INTERVAL_SECONDS = int(getenv("BACKFILL_READ_INTERVAL_SECONDS", "60"))
+        self.BACKFILL_CHECKPOINT_PATH = getenv("BACKFILL_CHECKPOINT_PATH", "backfill-checkpoint.json")
+        self.EKM_RATE_LIMIT_PER_MINUTE = float(getenv("EKM_RATE_LIMIT_PER_MINUTE", "0"))
+        self.EKM_RATE_LIMIT_BURST = float(getenv("EKM_RATE_LIMIT_BURST", "10"))
+        self.EKM_RATE_LIMIT_FILE = getenv("EKM_RATE_LIMIT_FILE")
+        self.RESILIENCE_ENABLED = getenv("RESILIENCE_ENABLED", "true").lower() == "true"
+        self.RETRY_MAX_ATTEMPTS = int(getenv("RETRY_MAX_ATTEMPTS", "3"))
+        self.RETRY_BASE_SECONDS = float(getenv("RETRY_BASE_SECONDS", "0.5"))
+        self.RETRY_MAX_SECONDS = float(getenv("RETRY_MAX_SECONDS", "10"))
+        self.RETRY_BUDGET_RATIO = float(getenv("RETRY_BUDGET_RATIO", "0.2"))
+        self.RETRY_BUDGET_MIN_PER_SECOND = float(getenv("RETRY_BUDGET_MIN_PER_SECOND", "1"))
+        self.BREAKER_FAILURE_THRESHOLD = int(getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+        self.BREAKER_RESET_SECONDS = float(getenv("BREAKER_RESET_SECONDS", "30"))
+        self.CONFIG_RELOAD = getenv("CONFIG_RELOAD", "false").lower() == "true"
+        self.LOG_LEVEL = getenv("LOG_LEVEL", "INFO").upper()
+        self.LOG_FORMAT = getenv("LOG_FORMAT", "text")
+        self.LOG_ASYNC = getenv("LOG_ASYNC", "true").lower() == "true"
+        self.LOG_QUEUE_SIZE = int(getenv("LOG_QUEUE_SIZE", "10000"))
+        self.LOG_REPEAT_BURST = int(getenv("LOG_REPEAT_BURST", "5"))
+        self.LOG_REPEAT_WINDOW_SECONDS = float(getenv("LOG_REPEAT_WINDOW_SECONDS", "60"))
+        self.PROFILE_DIR = getenv("PROFILE_DIR")
+        self.PROFILE_CYCLES = int(getenv("PROFILE_CYCLES", "0"))
+        self.PROFILE_SIGNAL_CYCLES = int(getenv("PROFILE_SIGNAL_CYCLES", "3"))
+        self.TRACEMALLOC_EVERY = int(getenv("TRACEMALLOC_EVERY", "0"))
+        self.PROFILE_KEEP = int(getenv("PROFILE_KEEP", "20"))
+        self.METRICS_PORT = int(getenv("METRICS_PORT", "0"))
+        self.METRICS_HOST = getenv("METRICS_HOST", "127.0.0.1")
 
         # Validation
         required = [
@@ -22,5 +100,48 @@ class Settings:
         missing = [name for name, value in required if not value]
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+        if self.EXTRACTION_MODE not in ("single", "fleet", "pipeline"):
+            raise ValueError(f"Invalid EXTRACTION_MODE: {self.EXTRACTION_MODE}")
+        if self.SCHEDULER_OVERLAP_POLICY not in ("skip", "queue", "concurrent"):
+            raise ValueError(f"Invalid SCHEDULER_OVERLAP_POLICY: {self.SCHEDULER_OVERLAP_POLICY}")
+        if self.SIGNING_MODE not in ("record", "merkle"):
+            raise ValueError(f"Invalid SIGNING_MODE: {self.SIGNING_MODE}")
+        if self.DEDUP_MODE not in ("suppress", "heartbeat"):
+            raise ValueError(f"Invalid DEDUP_MODE: {self.DEDUP_MODE}")
+        if self.INGEST_COMPRESSION not in ("gzip", "zstd", "none"):
+            raise ValueError(f"Invalid INGEST_COMPRESSION: {self.INGEST_COMPRESSION}")
+        if self.LOG_LEVEL not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+            raise ValueError(f"Invalid LOG_LEVEL: {self.LOG_LEVEL}")
+        if self.LOG_FORMAT not in ("text", "json"):
+            raise ValueError(f"Invalid LOG_FORMAT: {self.LOG_FORMAT}")
+
+_settings: Optional[Settings] = None
+_settings_lock = threading.Lock()
+
+def get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+def configure(new_settings: Optional[Settings] = None) -> Optional[Settings]:
+    # Installs the settings every module sees; None drops them so the next access re-reads the environment
+    global _settings
+    with _settings_lock:
+        previous, _settings = _settings, new_settings
+    return previous
+
+class _SettingsProxy:
+    # Loads and validates on first attribute access instead of at import time
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(get_settings(), name)
 
-settings = Settings()
\ No newline at end of file
+settings = _SettingsProxy()
\ No newline at end of file
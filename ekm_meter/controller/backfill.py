@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from ekm_meter.config.settings import settings
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+from ekm_meter.service.hashing import HashingService
+from ekm_meter.service.ingestion import CloudIngestionService
+from ekm_meter.utils.http import create_session
+from ekm_meter.utils.logger import configure_logging, setup_logger
+from ekm_meter.utils.rate_limit import create_rate_limiter
+from ekm_meter.utils.resilience import ResiliencePolicy
+
+logger = setup_logger("EKMBackfill")
+
+@dataclass(frozen=True)
+class WorkUnit:
+    meter_number: str
+    index: int
+    start: float
+    end: float
+
+def plan_units(meter_numbers: List[str], start: float, end: float, window_seconds: float) -> Iterator[WorkUnit]:
+    # One unit is one history request; windows go round the meters so every meter's checkpoint advances together
+    index = 0
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + window_seconds, end)
+        for meter_number in meter_numbers:
+            yield WorkUnit(meter_number, index, window_start, window_end)
+        index += 1
+        window_start = window_end
+
+class BackfillCheckpoint:
+    def __init__(self, path: str, start: float, end: float, window_seconds: float):
+        self.path = path
+        self.job = {"start": start, "end": end, "window_seconds": window_seconds}
+        self.lock = threading.Lock()
+        # Per meter: every unit up to "through" is done, plus whichever later units finished out of order
+        self.through: Dict[str, int] = {}
+        self.done: Dict[str, Set[int]] = {}
+        self._load()
+
+    def is_done(self, unit: WorkUnit) -> bool:
+        with self.lock:
+            return unit.index <= self.through.get(unit.meter_number, -1) or unit.index in self.done.get(unit.meter_number, ())
+
+    def mark_done(self, unit: WorkUnit):
+        with self.lock:
+            through = self.through.get(unit.meter_number, -1)
+            done = self.done.setdefault(unit.meter_number, set())
+            done.add(unit.index)
+            while through + 1 in done:
+                through += 1
+                done.remove(through)
+            self.through[unit.meter_number] = through
+
+    def save(self):
+        with self.lock:
+            state = dict(
+                self.job,
+                meters={
+                    meter_number: {"through": through, "done": sorted(self.done.get(meter_number, ()))}
+                    for meter_number, through in self.through.items()
+                },
+            )
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def saved_end(path: str) -> Optional[float]:
+        try:
+            with open(path) as f:
+                return json.load(f).get("end")
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        if {name: state.get(name) for name in self.job} != self.job:
+            raise RuntimeError(
+                f"Checkpoint {self.path} belongs to a different backfill "
+                f"({state.get('start')} to {state.get('end')}, {state.get('window_seconds')}s windows)"
+            )
+        for meter_number, progress in state.get("meters", {}).items():
+            self.through[meter_number] = progress["through"]
+            self.done[meter_number] = set(progress["done"])
+
+class BackfillRunner:
+    def __init__(
+        self,
+        ekm_repo: EKMAPIRepository,
+        hashing_service: HashingService,
+        ingestion_service: CloudIngestionService,
+        checkpoint: BackfillCheckpoint,
+        workers: Optional[int] = None,
+        reads_per_request: Optional[int] = None,
+        checkpoint_seconds: float = 5.0,
+    ):
+        self.ekm_repo = ekm_repo
+        self.hashing_service = hashing_service
+        self.ingestion_service = ingestion_service
+        self.checkpoint = checkpoint
+        self.workers = workers or settings.BACKFILL_WORKERS
+        self.reads_per_request = reads_per_request or settings.BACKFILL_READS_PER_REQUEST
+        self.checkpoint_seconds = checkpoint_seconds
+        self.last_save = time.monotonic()
+        self.units_done = 0
+        self.units_failed = 0
+        self.readings = 0
+
+    def run(self, units: Iterator[WorkUnit]) -> Tuple[int, int]:
+        started = time.monotonic()
+        # Units are submitted lazily with a bounded number in flight, so only a few windows of readings
+        # are ever held in memory however long the range is
+        in_flight: Dict[Any, WorkUnit] = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ekm-backfill")
+        try:
+            for unit in units:
+                if self.checkpoint.is_done(unit):
+                    continue
+                if len(in_flight) >= self.workers * 2:
+                    self._collect(in_flight)
+                in_flight[executor.submit(self._process, unit)] = unit
+            while in_flight:
+                self._collect(in_flight)
+        finally:
+            # On an interrupt, units still running are redone on the next run; finished ones are kept
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.checkpoint.save()
+        logger.info(
+            "Backfill finished in %.1fs: %d requests (%d readings) delivered, %d failed",
+            time.monotonic() - started,
+            self.units_done,
+            self.readings,
+            self.units_failed,
+        )
+        return self.units_done, self.units_failed
+
+    def _collect(self, in_flight: Dict[Any, WorkUnit]):
+        finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in finished:
+            unit = in_flight.pop(future)
+            try:
+                self.readings += future.result()
+            except Exception as e:
+                self.units_failed += 1
+                logger.error(
+                    "Backfill of meter %s from %s to %s failed, will retry on the next run: %s",
+                    unit.meter_number,
+                    _format_time(unit.start),
+                    _format_time(unit.end),
+                    e,
+                )
+                continue
+            self.checkpoint.mark_done(unit)
+            self.units_done += 1
+        if time.monotonic() - self.last_save >= self.checkpoint_seconds:
+            self.checkpoint.save()
+            self.last_save = time.monotonic()
+            logger.info("Backfill progress: %d requests, %d readings delivered", self.units_done, self.readings)
+
+    def _process(self, unit: WorkUnit) -> int:
+        readings = self.ekm_repo.fetch_meter_history(unit.meter_number, unit.start, unit.end, self.reads_per_request)
+        if len(readings) >= self.reads_per_request:
+            # Windows are sized to hold one read fewer than a request returns, so a full reply means the meter
+            # reads more often than BACKFILL_READ_INTERVAL_SECONDS and the rest of this window was cut off
+            logger.warning(
+                "Backfill of meter %s from %s to %s returned the maximum of %d reads and may be incomplete; "
+                "check BACKFILL_READ_INTERVAL_SECONDS against the meter's read interval",
+                unit.meter_number,
+                _format_time(unit.start),
+                _format_time(unit.end),
+                len(readings),
+            )
+        records = [
+            {
+                "meter_number": unit.meter_number,
+                "hashed_data": self.hashing_service.hash_meter_data(meter_data),
+                "key_id": self.hashing_service.fingerprint,
+                "reading_date": meter_data.reading_date,
+            }
+            for meter_data in readings
+        ]
+        self._deliver(records)
+        return len(records)
+
+    def _deliver(self, records: List[Dict[str, Any]]):
+        if not settings.INGEST_BATCHING:
+            for record in records:
+                self.ingestion_service.ingest(record)
+            return
+        for start in range(0, len(records), settings.INGEST_BATCH_MAX_RECORDS):
+            acks = self.ingestion_service.ingest_batch(records[start:start + settings.INGEST_BATCH_MAX_RECORDS])
+            rejected = [ack for ack in acks if ack.get("status") != "ok"]
+            if rejected:
+                raise RuntimeError(f"Cloud rejected {len(rejected)} records: {rejected[0].get('error')}")
+
+def parse_time(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Fetch, sign and ingest historical EKM reads")
+    parser.add_argument("--start", required=True, help="ISO 8601 time (UTC unless given) or epoch seconds")
+    parser.add_argument("--end", default=None, help="defaults to now")
+    parser.add_argument("--meters", default=None, help="comma-separated meter numbers, defaults to EKM_METER_NUMBERS")
+    parser.add_argument("--checkpoint", default=None, help="defaults to BACKFILL_CHECKPOINT_PATH")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = parse_time(args.start)
+    checkpoint_path = args.checkpoint or settings.BACKFILL_CHECKPOINT_PATH
+    if args.end:
+        end = parse_time(args.end)
+    else:
+        # Rerunning the same command after a crash resumes the range it started, not one ending now
+        end = BackfillCheckpoint.saved_end(checkpoint_path) or float(int(time.time()))
+    meter_numbers = [number.strip() for number in args.meters.split(",") if number.strip()] if args.meters else settings.EKM_METER_NUMBERS
+    window_seconds = max(settings.BACKFILL_READS_PER_REQUEST - 1, 1) * settings.BACKFILL_READ_INTERVAL_SECONDS
+    checkpoint = BackfillCheckpoint(checkpoint_path, start, end, window_seconds)
+
+    session = create_session()
+    resilience = settings.RESILIENCE_ENABLED
+    rate_limiter = create_rate_limiter()
+    ekm_repo = EKMAPIRepository(session, ResiliencePolicy("ekm") if resilience else None, rate_limiter)
+    hashing_service = HashingService()
+    ingestion_service = CloudIngestionService(session, ResiliencePolicy("ingest") if resilience else None)
+    logger.info(
+        "Backfilling %d meters from %s to %s with key %s, checkpointing to %s",
+        len(meter_numbers),
+        _format_time(start),
+        _format_time(end),
+        hashing_service.fingerprint,
+        checkpoint.path,
+    )
+    runner = BackfillRunner(ekm_repo, hashing_service, ingestion_service, checkpoint, workers=args.workers)
+    try:
+        _, failed = runner.run(plan_units(meter_numbers, start, end, window_seconds))
+    finally:
+        if rate_limiter:
+            rate_limiter.close()
+        session.close()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
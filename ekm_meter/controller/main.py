@@ -1,29 +1,507 @@
+import signal
 import time
+from typing import Optional
+from ekm_meter.config.reload import ConfigWatcher
+from ekm_meter.controller.pipeline import Pipeline
+from ekm_meter.controller.scheduler import FixedRateScheduler
+from ekm_meter.domain.models import FetchResult
 from ekm_meter.repository.ekm_api import EKMAPIRepository
-from ekm_meter.service.hashing import HashingService
-from ekm_meter.service.ingestion import CloudIngestionService
-from ekm_meter.config.settings import settings
-from ekm_meter.utils.logger import setup_logger
+from ekm_meter.repository.spool import Spool, SpoolReplayer
+from ekm_meter.repository.timeseries import TimeSeriesStore
+from ekm_meter.service.dedup import ChangeDetector
+from ekm_meter.service.fleet import FleetFetchService
+from ekm_meter.service.hashing import HashingService, key_fingerprint, load_private_key
+from ekm_meter.service.ingestion import MISSING_ACK, CloudIngestionService, IngestBatcher
+from ekm_meter.service.signer_pool import SignerPool
+from ekm_meter.config.settings import configure, settings
+from ekm_meter.utils.http import create_session
+from ekm_meter.utils.jitter import phase_offset
+from ekm_meter.utils.logger import configure_logging, setup_logger
+from ekm_meter.utils.metrics import CYCLE_SECONDS, QUEUE_DEPTH, start_metrics_server
+from ekm_meter.utils.profiling import CycleProfiler
+from ekm_meter.utils.rate_limit import create_rate_limiter
+from ekm_meter.utils.resilience import ResiliencePolicy, rejection_status
 
 logger = setup_logger("EKMController")
+_profiler: Optional[CycleProfiler] = None
 
-def run_extraction_cycle():
-    ekm_repo = EKMAPIRepository()
-    hashing_service = HashingService()
-    ingestion_service = CloudIngestionService()
+def run_extraction_cycle(
+    max_cycles: Optional[int] = None, watcher: Optional[ConfigWatcher] = None, private_key=None
+):
+    session = create_session()
+    rate_limiter = create_rate_limiter()
+    ekm_repo = EKMAPIRepository(session, _resilience("ekm"), rate_limiter)
+    hashing_service = HashingService(private_key)
+    ingestion_service = CloudIngestionService(session, _resilience("ingest"))
+    spool, replayer = _start_spool(ingestion_service)
+    store = TimeSeriesStore() if settings.STORE_DIR else None
+    change_detector = ChangeDetector() if settings.DEDUP_ENABLED else None
+    scheduler = FixedRateScheduler(phase_seconds=phase_offset(settings.EKM_METER_NUMBER, settings.SCHEDULER_JITTER_SECONDS))
 
-    while True:
+    def cycle():
+        started = time.monotonic()
         try:
-            logger.info("Starting extraction cycle")
+            logger.info("Starting extraction cycle (%.0f ms after tick)", scheduler.last_lateness * 1000)
             meter_data = ekm_repo.fetch_meter_data()
-            logger.info(f"Fetched meter data for meter {settings.EKM_METER_NUMBER}")
+            logger.info("Fetched meter data for meter %s", settings.EKM_METER_NUMBER)
+            if change_detector and not change_detector.check(settings.EKM_METER_NUMBER, meter_data):
+                logger.info("Meter data unchanged since last cycle, skipping signing")
+                if change_detector.heartbeat:
+                    heartbeat = change_detector.heartbeat_record(settings.EKM_METER_NUMBER, meter_data)
+                    if spool:
+                        spool.append(heartbeat)
+                    else:
+                        ingestion_service.ingest(heartbeat)
+                _log_dedup_stats(change_detector)
+                return
             hashed_data = hashing_service.hash_meter_data(meter_data)
-            logger.info("Hashed meter data successfully")
-            ingestion_service.ingest(hashed_data)
-            logger.info("Ingested hashed data to cloud successfully")
+            logger.info("Hashed meter data successfully with key %s", hashing_service.fingerprint)
+            if store:
+                _store_readings(store, [FetchResult(settings.EKM_METER_NUMBER, meter_data)])
+            if spool:
+                record = {
+                    "meter_number": settings.EKM_METER_NUMBER,
+                    "hashed_data": hashed_data,
+                    "key_id": hashing_service.fingerprint,
+                }
+                spool.append(record)
+                spool.sync()
+                replayer.notify()
+                logger.info("Spooled hashed data for upload (%d records pending)", spool.backlog())
+            else:
+                ingestion_service.ingest({"hashed_data": hashed_data, "key_id": hashing_service.fingerprint})
+                logger.info("Ingested hashed data to cloud successfully")
+            if change_detector:
+                change_detector.commit(settings.EKM_METER_NUMBER)
+        except Exception as e:
+            if change_detector:
+                change_detector.rollback(settings.EKM_METER_NUMBER)
+            logger.error("Error during extraction cycle: %s", e)
+        finally:
+            CYCLE_SECONDS.labels("single").observe(time.monotonic() - started)
+
+    try:
+        _run_schedule(scheduler, cycle, max_cycles, watcher)
+    finally:
+        _stop_spool(spool, replayer)
+        if store:
+            store.close()
+        if rate_limiter:
+            rate_limiter.close()
+        session.close()
+
+def run_fleet_extraction_cycle(
+    max_cycles: Optional[int] = None, watcher: Optional[ConfigWatcher] = None, private_key=None
+):
+    session = create_session()
+    rate_limiter = create_rate_limiter()
+    ekm_repo = EKMAPIRepository(session, _resilience("ekm"), rate_limiter)
+    fleet_service = FleetFetchService(ekm_repo)
+    hashing_service = HashingService(private_key)
+    signer_pool = SignerPool(private_key=hashing_service.private_key) if settings.SIGNER_WORKERS > 0 else None
+    ingestion_service = CloudIngestionService(session, _resilience("ingest"))
+    spool, replayer = _start_spool(ingestion_service)
+    batcher = IngestBatcher(ingestion_service) if settings.INGEST_BATCHING and not spool else None
+    store = TimeSeriesStore() if settings.STORE_DIR else None
+    change_detector = ChangeDetector() if settings.DEDUP_ENABLED else None
+    meter_numbers = settings.EKM_METER_NUMBERS
+    scheduler = FixedRateScheduler()
+
+    def cycle():
+        logger.info(
+            "Starting fleet extraction cycle for %d meters (%.0f ms after tick)",
+            len(meter_numbers),
+            scheduler.last_lateness * 1000,
+        )
+        started = time.monotonic()
+        fetched, failed = [], 0
+        for result in fleet_service.fetch_all(meter_numbers):
+            if result.ok:
+                fetched.append(result)
+            else:
+                failed += 1
+                logger.error("Failed to fetch meter %s: %s", result.meter_number, result.error)
+        heartbeats = []
+        if change_detector:
+            fetched, heartbeats = _filter_unchanged(change_detector, fetched)
+        records, sign_failures = _sign_results(hashing_service, signer_pool, fetched)
+        logger.info("Signed %d records with key %s", len(records), hashing_service.fingerprint)
+        if store:
+            _store_readings(store, fetched)
+        records.extend(heartbeats)
+        succeeded, failed = 0, failed + sign_failures
+        for record in records:
+            try:
+                if spool:
+                    spool.append(record)
+                    _settle(change_detector, record, True)
+                    succeeded += 1
+                elif batcher:
+                    acked, rejected = _count_acks(batcher.add(record), change_detector)
+                    succeeded, failed = succeeded + acked, failed + rejected
+                else:
+                    ingestion_service.ingest(record)
+                    _settle(change_detector, record, True)
+                    succeeded += 1
+            except Exception as e:
+                _settle(change_detector, record, False)
+                failed += 1
+                logger.error("Error ingesting meter %s: %s", record["meter_number"], e)
+        if spool:
+            spool.sync()
+            replayer.notify()
+        elif batcher:
+            acked, rejected = _count_acks(batcher.flush(), change_detector)
+            succeeded, failed = succeeded + acked, failed + rejected
+        CYCLE_SECONDS.labels("fleet").observe(time.monotonic() - started)
+        logger.info(
+            "Fleet extraction cycle finished in %.2fs: %d succeeded, %d failed",
+            time.monotonic() - started,
+            succeeded,
+            failed,
+        )
+        if change_detector:
+            _log_dedup_stats(change_detector)
+
+    try:
+        _run_schedule(scheduler, cycle, max_cycles, watcher)
+    finally:
+        _stop_spool(spool, replayer)
+        if store:
+            store.close()
+        if signer_pool:
+            signer_pool.shutdown()
+        fleet_service.close()
+        if rate_limiter:
+            rate_limiter.close()
+        session.close()
+
+def run_pipeline_extraction_cycle(
+    max_cycles: Optional[int] = None, watcher: Optional[ConfigWatcher] = None, private_key=None
+):
+    session = create_session()
+    rate_limiter = create_rate_limiter()
+    ekm_repo = EKMAPIRepository(session, _resilience("ekm"), rate_limiter)
+    hashing_service = HashingService(private_key)
+    ingestion_service = CloudIngestionService(session, _resilience("ingest"))
+    spool, replayer = _start_spool(ingestion_service)
+    batcher = IngestBatcher(ingestion_service) if settings.INGEST_BATCHING and not spool else None
+    store = TimeSeriesStore() if settings.STORE_DIR else None
+    change_detector = ChangeDetector() if settings.DEDUP_ENABLED else None
+    meter_numbers = settings.EKM_METER_NUMBERS
+    # Same stable per-meter offsets as fleet mode; meters are handed to the fetch stage in offset order
+    phases = sorted(
+        ((phase_offset(meter_number, settings.SCHEDULER_JITTER_SECONDS), meter_number) for meter_number in meter_numbers)
+    )
+    scheduler = FixedRateScheduler()
+
+    def fetch(meter_number):
+        return meter_number, ekm_repo.fetch_meter_data(meter_number)
+
+    def sign(fetched):
+        meter_number, meter_data = fetched
+        if change_detector and not change_detector.check(meter_number, meter_data):
+            return change_detector.heartbeat_record(meter_number, meter_data) if change_detector.heartbeat else None
+        record = {
+            "meter_number": meter_number,
+            "hashed_data": hashing_service.hash_meter_data(meter_data),
+            "key_id": hashing_service.fingerprint,
+        }
+        if store:
+            try:
+                store.append(meter_number, meter_data)
+            except Exception as e:
+                logger.error("Error storing reading for meter %s: %s", meter_number, e)
+        return record
+
+    def ingest(record):
+        try:
+            if spool:
+                spool.append(record)
+            elif batcher:
+                _count_acks(batcher.add(record), change_detector)
+                return
+            else:
+                ingestion_service.ingest(record)
+        except Exception:
+            _settle(change_detector, record, False)
+            raise
+        _settle(change_detector, record, True)
+
+    pipeline = (
+        Pipeline()
+        .add_stage("fetch", fetch, settings.PIPELINE_FETCH_WORKERS)
+        .add_stage("sign", sign, settings.PIPELINE_SIGN_WORKERS)
+        .add_stage("ingest", ingest, settings.PIPELINE_INGEST_WORKERS)
+    )
+
+    def cycle():
+        logger.info(
+            "Starting pipeline extraction cycle for %d meters (%.0f ms after tick)",
+            len(meter_numbers),
+            scheduler.last_lateness * 1000,
+        )
+        started = time.monotonic()
+        # submit blocks while the fetch queue is full, so a slow ingest stage throttles the whole cycle
+        for phase, meter_number in phases:
+            delay = started + phase - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            pipeline.submit(meter_number)
+        if batcher:
+            # Records trickle in from the sign stage; a partial batch goes out once it has waited the linger time
+            while not pipeline.join(timeout=min(max(batcher.linger_seconds, 0.1), 1.0)):
+                _count_acks(batcher.flush_due(), change_detector)
+            _count_acks(batcher.flush(), change_detector)
+        else:
+            pipeline.join()
+        if store:
+            _store_readings(store, [])
+        if spool:
+            spool.sync()
+            replayer.notify()
+        CYCLE_SECONDS.labels("pipeline").observe(time.monotonic() - started)
+        logger.info(
+            "Pipeline extraction cycle finished in %.2fs, signed with key %s",
+            time.monotonic() - started,
+            hashing_service.fingerprint,
+        )
+        for name, stage in pipeline.stats().items():
+            logger.info(
+                "Stage %s: %d processed, %d errors, queue %d/%d, %.1f/s, %.0f%% busy",
+                name,
+                stage["processed"],
+                stage["errors"],
+                stage["queue_depth"],
+                stage["queue_capacity"],
+                stage["throughput_per_second"],
+                stage["utilization"] * 100,
+            )
+        if change_detector:
+            _log_dedup_stats(change_detector)
+
+    pipeline.start()
+    try:
+        _run_schedule(scheduler, cycle, max_cycles, watcher)
+    finally:
+        pipeline.stop()
+        _stop_spool(spool, replayer)
+        if store:
+            store.close()
+        if rate_limiter:
+            rate_limiter.close()
+        session.close()
+
+def run_with_reload():
+    if not settings.CONFIG_RELOAD:
+        return _runner()()
+    watcher = ConfigWatcher()
+    # Runs are rebuilt around the key object that last loaded, never by re-reading a path that may now be broken
+    private_key = load_private_key(settings.PRIVATE_KEY_PATH)
+    logger.info("Signing with key %s", key_fingerprint(private_key))
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, lambda signum, frame: watcher.request_reload())
+    while True:
+        _runner()(watcher=watcher, private_key=private_key)
+        if not watcher.requested.is_set():
+            return
+        try:
+            new_settings = watcher.load()
+            # A key that does not load must not replace the one that works
+            new_private_key = load_private_key(new_settings.PRIVATE_KEY_PATH)
         except Exception as e:
-            logger.error(f"Error during extraction cycle: {e}")
-        time.sleep(settings.EXTRACTION_INTERVAL_SECONDS)
+            watcher.reject()
+            logger.error("Reload failed, keeping the current configuration and key: %s", e)
+            continue
+        watcher.accept(new_settings.PRIVATE_KEY_PATH)
+        configure(new_settings)
+        previous, current = key_fingerprint(private_key), key_fingerprint(new_private_key)
+        private_key = new_private_key
+        if previous != current:
+            # Records already spooled or batched keep the key_id of the key that signed them
+            logger.info("Signing key rotated from %s to %s", previous, current)
+        logger.info(
+            "Reloaded configuration (%d meters, mode %s)", len(settings.EKM_METER_NUMBERS), settings.EXTRACTION_MODE
+        )
+
+def _runner():
+    if settings.EXTRACTION_MODE == "fleet":
+        return run_fleet_extraction_cycle
+    if settings.EXTRACTION_MODE == "pipeline":
+        return run_pipeline_extraction_cycle
+    return run_extraction_cycle
+
+def _run_schedule(scheduler, cycle, max_cycles, watcher):
+    if settings.PROFILE_DIR:
+        cycle = _cycle_profiler().wrap(cycle)
+    if not watcher:
+        scheduler.run(cycle, max_ticks=max_cycles)
+        return
+
+    def job():
+        cycle()
+        # Changes apply between cycles: end this schedule and let run_with_reload rebuild on the new settings
+        watcher.check()
+
+    watcher.attach(scheduler.stop)
+    try:
+        scheduler.run(job, max_ticks=max_cycles)
+    finally:
+        watcher.attach(None)
+
+def _cycle_profiler():
+    # One per process, so cycle counts, pending signal requests and tracemalloc state survive reloads
+    global _profiler
+    if _profiler is None:
+        _profiler = CycleProfiler()
+        _profiler.install_signal_handlers()
+    return _profiler
+
+def _resilience(endpoint):
+    # One policy per endpoint, shared by every worker, so budgets and breakers see all traffic to that host
+    return ResiliencePolicy(endpoint) if settings.RESILIENCE_ENABLED else None
+
+def _start_spool(ingestion_service):
+    if not settings.SPOOL_DIR:
+        return None, None
+    spool = Spool()
+    replayer = SpoolReplayer(spool, _spool_sink(ingestion_service))
+    QUEUE_DEPTH.labels("spool").set_function(spool.backlog)
+    replayer.start()
+    if spool.backlog():
+        logger.info("Replaying %d spooled records from %s", spool.backlog(), settings.SPOOL_DIR)
+    return spool, replayer
+
+def _stop_spool(spool, replayer):
+    if spool:
+        replayer.stop()
+        spool.close()
+
+def _spool_sink(ingestion_service):
+    # True when delivered, False to retry later, or the reason the receiver rejected the record for good
+    if settings.INGEST_BATCHING:
+        def ingest_batch(records):
+            return [_ack_result(ack) for ack in ingestion_service.ingest_batch(records)]
+        return ingest_batch
+
+    def ingest_each(records):
+        results = []
+        for record in records:
+            try:
+                ingestion_service.ingest(record)
+            except RuntimeError as e:
+                status = rejection_status(e)
+                if status is None:
+                    logger.error("Spool replay paused: %s", e)
+                    break
+                results.append(f"HTTP {status}: {e}")
+                continue
+            results.append(True)
+        return results
+    return ingest_each
+
+def _ack_result(ack):
+    if ack.get("status") == "ok":
+        return True
+    # A missing acknowledgement says nothing about the record itself, so it is retried
+    if ack.get("error") == MISSING_ACK:
+        return False
+    return str(ack.get("error") or ack.get("status") or "rejected")
+
+def _sign_results(hashing_service, signer_pool, results):
+    records, failed = [], 0
+    if settings.SIGNING_MODE == "merkle":
+        # One signature per Merkle root; every record carries its own inclusion proof
+        for start in range(0, len(results), settings.MERKLE_BATCH_SIZE):
+            chunk = results[start:start + settings.MERKLE_BATCH_SIZE]
+            try:
+                proofs = hashing_service.hash_meter_batch([result.meter_data for result in chunk])
+            except Exception as e:
+                failed += len(chunk)
+                logger.error("Error signing batch of %d meters: %s", len(chunk), e)
+                continue
+            records.extend(
+                dict(proof, meter_number=result.meter_number, key_id=hashing_service.fingerprint)
+                for result, proof in zip(chunk, proofs)
+            )
+        return records, failed
+    if signer_pool:
+        try:
+            signatures = signer_pool.sign_meter_data([result.meter_data for result in results])
+        except RuntimeError as e:
+            logger.error("Error signing %d meters: %s", len(results), e)
+            return records, len(results)
+        return [
+            {"meter_number": result.meter_number, "hashed_data": signature, "key_id": hashing_service.fingerprint}
+            for result, signature in zip(results, signatures)
+        ], failed
+    for result in results:
+        try:
+            hashed_data = hashing_service.hash_meter_data(result.meter_data)
+            record = {
+                "meter_number": result.meter_number,
+                "hashed_data": hashed_data,
+                "key_id": hashing_service.fingerprint,
+            }
+            records.append(record)
+        except Exception as e:
+            failed += 1
+            logger.error("Error signing meter %s: %s", result.meter_number, e)
+    return records, failed
+
+def _store_readings(store, results):
+    for result in results:
+        try:
+            store.append(result.meter_number, result.meter_data)
+        except Exception as e:
+            logger.error("Error storing reading for meter %s: %s", result.meter_number, e)
+    try:
+        store.flush(force=False)
+    except Exception as e:
+        logger.error("Error writing readings to %s: %s", settings.STORE_DIR, e)
+
+def _filter_unchanged(change_detector, results):
+    changed, heartbeats = [], []
+    for result in results:
+        if change_detector.check(result.meter_number, result.meter_data):
+            changed.append(result)
+        elif change_detector.heartbeat:
+            heartbeats.append(change_detector.heartbeat_record(result.meter_number, result.meter_data))
+    return changed, heartbeats
+
+def _log_dedup_stats(change_detector):
+    stats = change_detector.stats()
+    logger.info(
+        "Change detection: %d signatures and %d uploads avoided of %d readings",
+        stats["signatures_avoided"],
+        stats["uploads_avoided"],
+        stats["checked"],
+    )
+
+def _settle(change_detector, record, delivered):
+    # Only a delivered reading becomes the baseline that later readings are compared against
+    if not change_detector or record.get("heartbeat"):
+        return
+    if delivered:
+        change_detector.commit(record["meter_number"])
+    else:
+        change_detector.rollback(record["meter_number"])
+
+def _count_acks(results, change_detector=None):
+    acked, rejected = 0, 0
+    for record, ack in results:
+        ok = ack.get("status") == "ok"
+        _settle(change_detector, record, ok)
+        if ok:
+            acked += 1
+        else:
+            rejected += 1
+            logger.error("Cloud rejected record for meter %s: %s", record["meter_number"], ack.get("error"))
+    return acked, rejected
 
 if __name__ == "__main__":
-    run_extraction_cycle()
\ No newline at end of file
+    configure_logging()
+    if settings.METRICS_PORT:
+        start_metrics_server()
+        logger.info("Serving metrics on http://%s:%d/metrics", settings.METRICS_HOST, settings.METRICS_PORT)
+    run_with_reload()
\ No newline at end of file
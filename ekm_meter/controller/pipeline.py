@@ -0,0 +1,110 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.logger import setup_logger
+from ekm_meter.utils.metrics import QUEUE_DEPTH
+
+logger = setup_logger("EKMPipeline")
+
+_STOP = object()
+
+class Stage:
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int, queue_size: int):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        # Bounded inbox: a full queue blocks the upstream stage instead of buffering without limit
+        self.inbox: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.threads: List[threading.Thread] = []
+
+    def record(self, ok: bool, elapsed: float):
+        with self.lock:
+            if ok:
+                self.processed += 1
+            else:
+                self.errors += 1
+            self.busy_seconds += elapsed
+
+class Pipeline:
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.stages: List[Stage] = []
+        self.started_at = 0.0
+
+    def add_stage(self, name: str, func: Callable[[Any], Any], workers: int = 1) -> "Pipeline":
+        self.stages.append(Stage(name, func, workers, self.queue_size))
+        return self
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            QUEUE_DEPTH.labels(f"pipeline_{stage.name}").set_function(stage.inbox.qsize)
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(stage, downstream), name=f"pipeline-{stage.name}-{worker}", daemon=True
+                )
+                thread.start()
+                stage.threads.append(thread)
+
+    def submit(self, item: Any):
+        self.stages[0].inbox.put(item)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        # Upstream stages hand items on before marking them done, so joining in order drains everything
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for stage in self.stages:
+            inbox = stage.inbox
+            with inbox.all_tasks_done:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                if not inbox.all_tasks_done.wait_for(lambda: not inbox.unfinished_tasks, remaining):
+                    return False
+        return True
+
+    def stop(self):
+        for stage in self.stages:
+            for _ in stage.threads:
+                stage.inbox.put(_STOP)
+            for thread in stage.threads:
+                thread.join()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        stats = {}
+        for stage in self.stages:
+            with stage.lock:
+                stats[stage.name] = {
+                    "workers": stage.workers,
+                    "queue_depth": stage.inbox.qsize(),
+                    "queue_capacity": stage.inbox.maxsize,
+                    "processed": stage.processed,
+                    "errors": stage.errors,
+                    "throughput_per_second": stage.processed / elapsed,
+                    "utilization": stage.busy_seconds / (elapsed * stage.workers),
+                }
+        return stats
+
+    def _work(self, stage: Stage, downstream: Optional[Stage]):
+        while True:
+            item = stage.inbox.get()
+            if item is _STOP:
+                stage.inbox.task_done()
+                return
+            started = time.monotonic()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                stage.record(False, time.monotonic() - started)
+                logger.error("Stage %s failed: %s", stage.name, e)
+            else:
+                stage.record(True, time.monotonic() - started)
+                if downstream is not None and result is not None:
+                    downstream.inbox.put(result)
+            finally:
+                stage.inbox.task_done()
\ No newline at end of file
@@ -0,0 +1,125 @@
+import math
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.logger import setup_logger
+from ekm_meter.utils.metrics import QUEUE_DEPTH, SCHEDULER_LATENESS_SECONDS, SCHEDULER_MISSED_TICKS
+
+logger = setup_logger("EKMScheduler")
+
+OVERLAP_POLICIES = ("skip", "queue", "concurrent")
+
+class FixedRateScheduler:
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        phase_seconds: float = 0.0,
+        overlap_policy: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.interval_seconds = interval_seconds or settings.EXTRACTION_INTERVAL_SECONDS
+        self.phase_seconds = phase_seconds % self.interval_seconds
+        self.overlap_policy = overlap_policy or settings.SCHEDULER_OVERLAP_POLICY
+        if self.overlap_policy not in OVERLAP_POLICIES:
+            raise ValueError(f"Invalid overlap policy: {self.overlap_policy}")
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.stopping = threading.Event()
+        self.pending: "queue.Queue[Optional[float]]" = queue.Queue()
+        self.active = 0
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.skipped_ticks = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        QUEUE_DEPTH.labels("scheduler").set_function(self.pending.qsize)
+
+    def next_tick(self, now: float) -> float:
+        # Ticks sit on wall-clock multiples of the interval (plus phase), never relative to the last run
+        return (math.floor((now - self.phase_seconds) / self.interval_seconds) + 1) * self.interval_seconds + self.phase_seconds
+
+    def run(self, job: Callable[[], None], max_ticks: Optional[int] = None):
+        worker = None
+        if self.overlap_policy != "concurrent":
+            worker = threading.Thread(target=self._drain, args=(job,), name="scheduler-worker", daemon=True)
+            worker.start()
+        tick = self.next_tick(self.clock())
+        try:
+            while not self.stopping.is_set() and (max_ticks is None or self.ticks < max_ticks):
+                delay = tick - self.clock()
+                if delay > 0 and self.stopping.wait(delay):
+                    break
+                lateness = self.clock() - tick
+                missed = int(lateness // self.interval_seconds)
+                if missed > 0:
+                    # The process was stalled past whole ticks: count them and fire once for the latest
+                    tick += missed * self.interval_seconds
+                    lateness -= missed * self.interval_seconds
+                    logger.warning("Missed %d scheduler ticks", missed)
+                self._record_tick(lateness, max(missed, 0))
+                self._dispatch(job, tick)
+                tick += self.interval_seconds
+        finally:
+            if worker:
+                self.pending.put(None)
+                worker.join()
+            # Concurrent cycles run on their own threads; never return while one still uses shared state
+            with self.idle:
+                self.idle.wait_for(lambda: self.active == 0)
+
+    def stop(self):
+        self.stopping.set()
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            return {
+                "ticks": self.ticks,
+                "missed_ticks": self.missed_ticks,
+                "skipped_ticks": self.skipped_ticks,
+                "active_cycles": self.active,
+                "queued_cycles": self.pending.qsize(),
+                "last_lateness_seconds": self.last_lateness,
+                "max_lateness_seconds": self.max_lateness,
+                "mean_lateness_seconds": self.total_lateness / self.ticks if self.ticks else 0.0,
+            }
+
+    def _record_tick(self, lateness: float, missed: int):
+        with self.lock:
+            self.ticks += 1
+            self.missed_ticks += missed
+            self.last_lateness = lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+            self.total_lateness += lateness
+        SCHEDULER_LATENESS_SECONDS.observe(lateness)
+        if missed:
+            SCHEDULER_MISSED_TICKS.inc(missed)
+
+    def _dispatch(self, job: Callable[[], None], tick: float):
+        with self.lock:
+            if self.overlap_policy == "skip" and self.active:
+                self.skipped_ticks += 1
+                logger.warning("Skipping tick at %.3f: previous cycle still running", tick)
+                return
+            self.active += 1
+        if self.overlap_policy == "concurrent":
+            threading.Thread(target=self._run_job, args=(job,), name="scheduler-cycle", daemon=True).start()
+        else:
+            self.pending.put(tick)
+
+    def _drain(self, job: Callable[[], None]):
+        while self.pending.get() is not None:
+            self._run_job(job)
+
+    def _run_job(self, job: Callable[[], None]):
+        try:
+            job()
+        except Exception as e:
+            logger.error("Scheduled cycle failed: %s", e)
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.idle.notify_all()
\ No newline at end of file
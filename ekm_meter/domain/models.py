@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Any, Dict
+from array import array
+from dataclasses import dataclass, fields, make_dataclass
+from typing import Any, Dict, Iterable, List, Optional, Type
 
 @dataclass
 class MeterData:
@@ -15,4 +16,78 @@ class MeterData:
     amps: float
     total_power_watts: float
     ct_ratio: float
-    frequency_hz: float
\ No newline at end of file
+    frequency_hz: float
+
+# Same fields without a per-instance __dict__, for holding large numbers of readings
+SlottedMeterData = make_dataclass(
+    "SlottedMeterData",
+    [(field.name, field.type) for field in fields(MeterData)],
+    slots=True,
+)
+SlottedMeterData.__module__ = __name__
+
+NUMERIC_FIELDS = ("total_watt_hour", "voltage", "amps", "total_power_watts", "ct_ratio", "frequency_hz")
+INTERNED_FIELDS = ("meter_name", "meter_day_of_week", "model", "address", "firmware")
+
+class MeterBatch:
+    def __init__(self):
+        # Numeric fields as contiguous float64 columns, repeated strings as codes into one shared table
+        self.numeric = {name: array("d") for name in NUMERIC_FIELDS}
+        self.codes = {name: array("I") for name in INTERNED_FIELDS}
+        self.strings: List[Optional[str]] = []
+        self.string_codes: Dict[Optional[str], int] = {}
+        self.reading_dates: List[str] = []
+        self.meter_data: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> "MeterBatch":
+        batch = cls()
+        batch.extend(records)
+        return batch
+
+    def append(self, record: Any):
+        for name in NUMERIC_FIELDS:
+            self.numeric[name].append(getattr(record, name))
+        for name in INTERNED_FIELDS:
+            self.codes[name].append(self._intern(getattr(record, name)))
+        self.reading_dates.append(record.reading_date)
+        self.meter_data.append(record.meter_data)
+
+    def extend(self, records: Iterable[Any]):
+        for record in records:
+            self.append(record)
+
+    def column(self, name: str) -> array:
+        return self.numeric[name]
+
+    def record(self, index: int, record_type: Type = MeterData) -> Any:
+        values = {name: self.numeric[name][index] for name in NUMERIC_FIELDS}
+        values.update({name: self.strings[self.codes[name][index]] for name in INTERNED_FIELDS})
+        return record_type(reading_date=self.reading_dates[index], meter_data=self.meter_data[index], **values)
+
+    def to_records(self, record_type: Type = MeterData) -> List[Any]:
+        return [self.record(index, record_type) for index in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.reading_dates)
+
+    def __getitem__(self, index: int) -> MeterData:
+        return self.record(index)
+
+    def _intern(self, value: Optional[str]) -> int:
+        code = self.string_codes.get(value)
+        if code is None:
+            code = self.string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+@dataclass
+class FetchResult:
+    meter_number: str
+    meter_data: Optional[MeterData] = None
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
\ No newline at end of file
@@ -1,35 +1,127 @@
+import time
 import requests
+from typing import Any, Dict, Iterator, List, Optional, Union
 from ekm_meter.config.settings import settings
 from ekm_meter.domain.models import MeterData
+from ekm_meter.utils.metrics import FETCH_SECONDS, METER_READINGS, record_error
+from ekm_meter.utils.rate_limit import FileTokenBucket, TokenBucket
+from ekm_meter.utils.resilience import ResiliencePolicy
 
 class EKMAPIRepository:
-    def __init__(self):
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        rate_limiter: Optional[Union[TokenBucket, FileTokenBucket]] = None,
+    ):
+        # Without a session every call falls back to a fresh connection via the requests module
+        self.http = session if session is not None else requests
+        self.resilience = resilience
+        self.rate_limiter = rate_limiter
         self.api_url = settings.EKM_API_URL
         self.meter_number = settings.EKM_METER_NUMBER
         self.api_key = settings.EKM_API_KEY
 
-    def fetch_meter_data(self) -> MeterData:
-        url = f"{self.api_url}/meters/{self.meter_number}/"
+    def fetch_meter_data(self, meter_number: Optional[str] = None) -> MeterData:
+        meter_number = meter_number or self.meter_number
+        url = f"{self.api_url}/meters/{meter_number}/"
         headers = {"Authorization": f"Bearer {self.api_key}"}
+        started = time.perf_counter()
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            # Extract required fields
-            return MeterData(
-                meter_name=data.get("meter_name"),
-                meter_data=data.get("meter_data"),
-                meter_day_of_week=data.get("meter_day_of_week"),
-                reading_date=data.get("reading_date"),
-                model=data.get("model"),
-                address=data.get("address"),
-                firmware=data.get("firmware"),
-                total_watt_hour=float(data.get("total_watt_hour", 0)),
-                voltage=float(data.get("voltage", 0)),
-                amps=float(data.get("amps", 0)),
-                total_power_watts=float(data.get("total_power_watts", 0)),
-                ct_ratio=float(data.get("ct_ratio", 0)),
-                frequency_hz=float(data.get("frequency_hz", 0)),
-            )
+            data = self._get_json(url, headers)
+            meter_data = self._to_meter_data(data)
         except Exception as e:
-            raise RuntimeError(f"Failed to fetch meter data: {e}")
\ No newline at end of file
+            METER_READINGS.labels(meter_number, "error").inc()
+            record_error("fetch", e)
+            raise RuntimeError(f"Failed to fetch meter data: {e}")
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - started)
+        METER_READINGS.labels(meter_number, "ok").inc()
+        return meter_data
+
+    def fetch_meters_data(self, meter_numbers: List[str]) -> Dict[str, MeterData]:
+        # EKM Push 3 accepts several meters joined by "~" in a single request
+        url = f"{self.api_url}/meters/{'~'.join(meter_numbers)}/"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        started = time.perf_counter()
+        requested = set(meter_numbers)
+        meters = {}
+        try:
+            data = self._get_json(url, headers)
+            records = data if isinstance(data, list) else data.get("meters", [data])
+            for record in records:
+                meter_number = str(record.get("meter_number") or record.get("meter_name"))
+                if meter_number not in requested:
+                    continue
+                try:
+                    meters[meter_number] = self._to_meter_data(record)
+                except (TypeError, ValueError) as e:
+                    # A malformed record only costs its own meter, not the rest of the batch
+                    record_error("fetch", e)
+                    continue
+        except Exception as e:
+            for meter_number in meter_numbers:
+                METER_READINGS.labels(meter_number, "error").inc()
+            record_error("fetch", e)
+            raise RuntimeError(f"Failed to fetch meter data: {e}")
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - started)
+        for meter_number in meter_numbers:
+            METER_READINGS.labels(meter_number, "ok" if meter_number in meters else "error").inc()
+        return meters
+
+    def fetch_meter_history(self, meter_number: str, start: float, end: float, count: int) -> List[MeterData]:
+        # EKM Push 3 returns up to `count` past reads taken in [start, end), oldest first
+        url = f"{self.api_url}/meters/{meter_number}/"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        params = {"start": int(start), "end": int(end), "count": count}
+        started = time.perf_counter()
+        try:
+            data = self._get_json(url, headers, params)
+            records = data if isinstance(data, list) else data.get("reads", [])
+            readings = [
+                self._to_meter_data(record)
+                for record in records
+                if str(record.get("meter_number") or record.get("meter_name")) == meter_number
+            ]
+        except Exception as e:
+            METER_READINGS.labels(meter_number, "error").inc()
+            record_error("fetch", e)
+            raise RuntimeError(f"Failed to fetch meter history: {e}")
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - started)
+        METER_READINGS.labels(meter_number, "ok").inc()
+        return readings
+
+    def _get_json(self, url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> Any:
+        def request():
+            # Retries spend quota too, so every attempt waits for its own slot
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            response = self.http.get(url, headers=headers, params=params, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        return self.resilience.call(request) if self.resilience else request()
+
+    @staticmethod
+    def chunk_meter_numbers(meter_numbers: List[str], batch_size: int) -> Iterator[List[str]]:
+        for start in range(0, len(meter_numbers), batch_size):
+            yield meter_numbers[start:start + batch_size]
+
+    def _to_meter_data(self, data: Dict[str, Any]) -> MeterData:
+        # Extract required fields
+        return MeterData(
+            meter_name=data.get("meter_name"),
+            meter_data=data.get("meter_data"),
+            meter_day_of_week=data.get("meter_day_of_week"),
+            reading_date=data.get("reading_date"),
+            model=data.get("model"),
+            address=data.get("address"),
+            firmware=data.get("firmware"),
+            total_watt_hour=float(data.get("total_watt_hour", 0)),
+            voltage=float(data.get("voltage", 0)),
+            amps=float(data.get("amps", 0)),
+            total_power_watts=float(data.get("total_power_watts", 0)),
+            ct_ratio=float(data.get("ct_ratio", 0)),
+            frequency_hz=float(data.get("frequency_hz", 0)),
+        )
\ No newline at end of file
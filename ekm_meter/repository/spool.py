@@ -0,0 +1,258 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.logger import setup_logger
+from ekm_meter.utils.metrics import REGISTRY
+
+# Frame header: payload length, sequence number, CRC32 of the payload
+FRAME_HEADER = struct.Struct(">IQI")
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+ACK_FILE = "ack.offset"
+DEAD_LETTER_FILE = "dead-letter.jsonl"
+
+logger = setup_logger("EKMSpool")
+
+DEAD_LETTERS = REGISTRY.counter("ekm_spool_dead_letters_total", "Spooled records the receiver rejected permanently")
+
+class Spool:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_max_bytes: Optional[int] = None,
+        fsync_records: Optional[int] = None,
+        fsync_seconds: Optional[float] = None,
+    ):
+        self.directory = directory or settings.SPOOL_DIR
+        self.segment_max_bytes = segment_max_bytes or settings.SPOOL_SEGMENT_BYTES
+        self.fsync_records = fsync_records or settings.SPOOL_FSYNC_RECORDS
+        self.fsync_seconds = fsync_seconds if fsync_seconds is not None else settings.SPOOL_FSYNC_SECONDS
+        self.lock = threading.RLock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.acked_seq = self._read_ack()
+        self.segments = self._list_segments()
+        self.next_seq = self._recover()
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+        self.read_cursor = (0, 0, 0)
+        self._open_active()
+
+    def append(self, record: Dict[str, Any]) -> int:
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        with self.lock:
+            seq = self.next_seq
+            self.active.write(FRAME_HEADER.pack(len(payload), seq, zlib.crc32(payload)) + payload)
+            self.next_seq += 1
+            self.unsynced += 1
+            # fsync is batched: at most fsync_records appends or fsync_seconds are at risk on power loss
+            if self.unsynced >= self.fsync_records or time.monotonic() - self.last_sync >= self.fsync_seconds:
+                self._sync()
+            if self.active.tell() >= self.segment_max_bytes:
+                self._rotate()
+            return seq
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def backlog(self) -> int:
+        return self.next_seq - 1 - self.acked_seq
+
+    def read(self, start_seq: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        records = []
+        for seq, record in self.iter_from(start_seq):
+            records.append((seq, record))
+            if len(records) >= limit:
+                break
+        return records
+
+    def iter_from(self, start_seq: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        with self.lock:
+            self.active.flush()
+            end_seq = self.next_seq
+            segments = list(self.segments)
+            cursor = self.read_cursor
+        for index, first_seq in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1] <= start_seq:
+                continue
+            # Sequential replay resumes where the previous read stopped instead of rescanning the segment
+            offset = cursor[2] if cursor[:2] == (start_seq, first_seq) else 0
+            for seq, payload, end_offset in self._read_segment(first_seq, offset):
+                if seq >= end_seq:
+                    return
+                if seq >= start_seq:
+                    self.read_cursor = (seq + 1, first_seq, end_offset)
+                    yield seq, json.loads(payload)
+
+    def ack(self, seq: int):
+        with self.lock:
+            if seq <= self.acked_seq:
+                return
+            self.acked_seq = seq
+            tmp_path = os.path.join(self.directory, ACK_FILE + ".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(str(seq))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, ACK_FILE))
+            self._compact()
+
+    def dead_letter(self, seq: int, record: Dict[str, Any], reason: str):
+        line = json.dumps({"seq": seq, "reason": reason, "record": record}, separators=(",", ":"))
+        with self.lock:
+            with open(os.path.join(self.directory, DEAD_LETTER_FILE), "a") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        DEAD_LETTERS.inc()
+
+    def close(self):
+        with self.lock:
+            self._sync()
+            self.active.close()
+
+    def _compact(self):
+        # A sealed segment can go once the next segment starts at or before the first unacked record
+        while len(self.segments) > 1 and self.segments[1] <= self.acked_seq + 1:
+            os.remove(self._segment_path(self.segments.pop(0)))
+
+    def _sync(self):
+        self.active.flush()
+        os.fsync(self.active.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def _rotate(self):
+        self._sync()
+        self.active.close()
+        self.segments.append(self.next_seq)
+        self._open_active()
+
+    def _open_active(self):
+        if not self.segments:
+            self.segments.append(self.next_seq)
+        self.active = open(self._segment_path(self.segments[-1]), "ab")
+
+    def _recover(self) -> int:
+        if not self.segments:
+            return self.acked_seq + 1
+        # Drop a torn frame left by a crash mid-write so appends continue from the last good record
+        last_seq, valid_bytes = self.segments[-1] - 1, 0
+        for seq, payload, end_offset in self._read_segment(self.segments[-1]):
+            last_seq, valid_bytes = seq, end_offset
+        path = self._segment_path(self.segments[-1])
+        if os.path.getsize(path) > valid_bytes:
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return max(last_seq, self.acked_seq) + 1
+
+    def _read_segment(self, first_seq: int, offset: int = 0) -> Iterator[Tuple[int, bytes, int]]:
+        try:
+            f = open(self._segment_path(first_seq), "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            while True:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                length, seq, crc = FRAME_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                offset += FRAME_HEADER.size + length
+                yield seq, payload, offset
+
+    def _read_ack(self) -> int:
+        try:
+            with open(os.path.join(self.directory, ACK_FILE)) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_seq:020d}{SEGMENT_SUFFIX}")
+
+class SpoolReplayer:
+    def __init__(
+        self,
+        spool: Spool,
+        sink: Callable[[List[Dict[str, Any]]], List[Union[bool, str]]],
+        rate_per_second: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        poll_seconds: float = 1.0,
+    ):
+        self.spool = spool
+        self.sink = sink
+        self.rate_per_second = rate_per_second if rate_per_second is not None else settings.SPOOL_REPLAY_RATE
+        self.batch_size = batch_size or settings.SPOOL_REPLAY_BATCH_SIZE
+        self.poll_seconds = poll_seconds
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def drain(self, max_records: Optional[int] = None) -> int:
+        sent = 0
+        started = time.monotonic()
+        while not self.stopping.is_set() and (max_records is None or sent < max_records):
+            limit = self.batch_size if max_records is None else min(self.batch_size, max_records - sent)
+            batch = self.spool.read(self.spool.acked_seq + 1, limit)
+            if not batch:
+                break
+            try:
+                results = self.sink([record for seq, record in batch])
+            except Exception:
+                results = []
+            # The sink answers True for delivered, False for retry later, or the reason a record was rejected
+            # for good. Only a contiguous prefix can be acknowledged; anything after a retry waits for the next
+            # drain, while a rejected record goes to the dead-letter file so it cannot block the records behind it
+            settled = 0
+            for (seq, record), result in zip(batch, results):
+                if isinstance(result, str):
+                    logger.error("Spooled record %d rejected, moved to %s: %s", seq, DEAD_LETTER_FILE, result)
+                    self.spool.dead_letter(seq, record, result)
+                elif not result:
+                    break
+                settled += 1
+            if settled:
+                self.spool.ack(batch[settled - 1][0])
+                sent += settled
+            if settled < len(batch):
+                break
+            if self.rate_per_second > 0:
+                ahead = sent / self.rate_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    self.stopping.wait(ahead)
+        return sent
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="spool-replay", daemon=True)
+        self.thread.start()
+
+    def notify(self):
+        self.wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        self.stopping.set()
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.drain()
+            self.wakeup.wait(self.poll_seconds)
+            self.wakeup.clear()
\ No newline at end of file
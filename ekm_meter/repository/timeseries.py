@@ -0,0 +1,302 @@
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ekm_meter.config.settings import settings
+from ekm_meter.domain.models import INTERNED_FIELDS, NUMERIC_FIELDS, MeterData
+from ekm_meter.utils.logger import setup_logger
+
+logger = setup_logger("EKMStore")
+
+# One file per column in each meter's directory: int64 epoch milliseconds, float64 numeric fields,
+# uint32 codes into the meter's string table, and the rest of the reading as JSON behind uint64 end offsets
+TIMESTAMP_FILE = "timestamp.i64"
+STRINGS_FILE = "strings.jsonl"
+EXTRA_OFFSETS_FILE = "extra.off"
+EXTRA_DATA_FILE = "extra.bin"
+EXTRA_FIELDS = ("reading_date", "meter_data")
+COLUMNS = (
+    [(TIMESTAMP_FILE, "q")]
+    + [(f"{name}.f64", "d") for name in NUMERIC_FIELDS]
+    + [(f"{name}.u32", "I") for name in INTERNED_FIELDS]
+    + [(EXTRA_OFFSETS_FILE, "Q")]
+)
+METER_NAME = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+class _MeterColumns:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.strings: List[Optional[str]] = []
+        self.string_codes: Dict[Optional[str], int] = {}
+        self.rows, self.last_timestamp, self.extra_bytes = self._recover()
+        self.pending = {filename: array(typecode) for filename, typecode in COLUMNS}
+        self.pending_strings: List[Optional[str]] = []
+        self.pending_extra = bytearray()
+
+    def append(self, timestamp_ms: int, meter_data: Any):
+        if timestamp_ms < self.last_timestamp:
+            raise ValueError(
+                f"Reading at {timestamp_ms} ms is older than the last stored reading ({self.last_timestamp} ms)"
+            )
+        self.last_timestamp = timestamp_ms
+        self.pending[TIMESTAMP_FILE].append(timestamp_ms)
+        for name in NUMERIC_FIELDS:
+            self.pending[f"{name}.f64"].append(getattr(meter_data, name))
+        for name in INTERNED_FIELDS:
+            self.pending[f"{name}.u32"].append(self._intern(getattr(meter_data, name)))
+        self.pending_extra += json.dumps(
+            {name: getattr(meter_data, name) for name in EXTRA_FIELDS}, separators=(",", ":")
+        ).encode("utf-8")
+        self.pending[EXTRA_OFFSETS_FILE].append(self.extra_bytes + len(self.pending_extra))
+
+    def pending_rows(self) -> int:
+        return len(self.pending[TIMESTAMP_FILE])
+
+    def flush(self):
+        if not self.pending_rows():
+            return
+        # New strings land before the codes that use them, and the offsets column is written last,
+        # so a crash mid-flush leaves at worst a ragged tail that _recover trims
+        sizes = {filename: self.rows * array(typecode).itemsize for filename, typecode in COLUMNS}
+        sizes[EXTRA_DATA_FILE] = self.extra_bytes
+        sizes[STRINGS_FILE] = _file_size(self._path(STRINGS_FILE))
+        try:
+            if self.pending_strings:
+                with open(self._path(STRINGS_FILE), "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(value) + "\n" for value in self.pending_strings))
+            with open(self._path(EXTRA_DATA_FILE), "ab") as f:
+                f.write(self.pending_extra)
+            for filename, typecode in COLUMNS:
+                with open(self._path(filename), "ab") as f:
+                    self.pending[filename].tofile(f)
+        except BaseException:
+            # Cut every file back to where this flush started, so a retry writes the batch exactly once
+            for filename, size in sizes.items():
+                _truncate(self._path(filename), size)
+            raise
+        self.pending_strings = []
+        self.rows += self.pending_rows()
+        self.extra_bytes += len(self.pending_extra)
+        self.pending = {filename: array(typecode) for filename, typecode in COLUMNS}
+        self.pending_extra = bytearray()
+
+    def _intern(self, value: Optional[str]) -> int:
+        code = self.string_codes.get(value)
+        if code is None:
+            code = self.string_codes[value] = len(self.strings)
+            self.strings.append(value)
+            self.pending_strings.append(value)
+        return code
+
+    def _recover(self) -> Tuple[int, int, int]:
+        try:
+            with open(self._path(STRINGS_FILE), "rb") as f:
+                lines = f.read().split(b"\n")
+        except FileNotFoundError:
+            lines = [b""]
+        # The last element is whatever followed the final newline: empty, or a torn write to drop
+        if lines[-1]:
+            with open(self._path(STRINGS_FILE), "r+b") as f:
+                f.truncate(sum(len(line) + 1 for line in lines[:-1]))
+        for line in lines[:-1]:
+            value = json.loads(line)
+            self.string_codes.setdefault(value, len(self.strings))
+            self.strings.append(value)
+
+        rows = min(_file_size(self._path(filename)) // array(typecode).itemsize for filename, typecode in COLUMNS)
+        extra_bytes = 0
+        while rows:
+            extra_bytes = self._read_value(EXTRA_OFFSETS_FILE, "Q", rows - 1)
+            if extra_bytes <= _file_size(self._path(EXTRA_DATA_FILE)):
+                break
+            rows -= 1
+        else:
+            extra_bytes = 0
+        for filename, typecode in COLUMNS:
+            _truncate(self._path(filename), rows * array(typecode).itemsize)
+        _truncate(self._path(EXTRA_DATA_FILE), extra_bytes)
+        last_timestamp = self._read_value(TIMESTAMP_FILE, "q", rows - 1) if rows else -(1 << 63)
+        return rows, last_timestamp, extra_bytes
+
+    def _read_value(self, filename: str, typecode: str, row: int) -> int:
+        values = array(typecode)
+        with open(self._path(filename), "rb") as f:
+            f.seek(row * values.itemsize)
+            values.fromfile(f, 1)
+        return values[0]
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+class TimeSeriesStore:
+    def __init__(self, directory: Optional[str] = None, flush_rows: int = 1024, flush_seconds: Optional[float] = None):
+        self.directory = directory or settings.STORE_DIR
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.STORE_FLUSH_SECONDS
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.meters: Dict[str, _MeterColumns] = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def append(self, meter_number: str, meter_data: Any, timestamp: Optional[float] = None):
+        columns = self._columns(meter_number)
+        with columns.lock:
+            if timestamp is not None:
+                timestamp_ms = _to_ms(timestamp)
+            else:
+                timestamp_ms = _to_ms(time.time())
+                if timestamp_ms < columns.last_timestamp:
+                    # The wall clock stepped back: hold at the last stored time until it catches up,
+                    # rather than reject every reading until then
+                    logger.warning(
+                        "Clock is %d ms behind the last stored reading for meter %s, storing at that time instead",
+                        columns.last_timestamp - timestamp_ms,
+                        meter_number,
+                    )
+                    timestamp_ms = columns.last_timestamp
+            columns.append(timestamp_ms, meter_data)
+            if columns.pending_rows() >= self.flush_rows:
+                columns.flush()
+
+    def flush(self, force: bool = True):
+        # Readings are buffered per meter and written column by column; every flush opens each column
+        # file of every meter with pending rows, so large fleets may want to pay that less than once per cycle
+        if not force and time.monotonic() - self.last_flush < self.flush_seconds:
+            return
+        self.last_flush = time.monotonic()
+        with self.lock:
+            meters = list(self.meters.values())
+        for columns in meters:
+            with columns.lock:
+                columns.flush()
+
+    def close(self):
+        self.flush()
+
+    def meter_numbers(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.directory) if os.path.isdir(os.path.join(self.directory, name)))
+
+    def count(self, meter_number: str) -> int:
+        columns = self._flushed(meter_number)
+        return columns.rows if columns else 0
+
+    def timestamps(self, meter_number: str, start: Optional[float] = None, end: Optional[float] = None) -> array:
+        # Epoch milliseconds, as stored
+        return self.column(meter_number, "timestamp", start, end)
+
+    def column(
+        self, meter_number: str, name: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> array:
+        filename, typecode = _column_file(name)
+        columns = self._flushed(meter_number)
+        if not columns or not columns.rows:
+            return array(typecode)
+        with self._mapped(columns, TIMESTAMP_FILE, "q") as timestamps:
+            first, last = _row_range(timestamps, start, end)
+        with self._mapped(columns, filename, typecode) as values:
+            return array(typecode, values[first:last])
+
+    def query(
+        self, meter_number: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Iterator[Tuple[float, MeterData]]:
+        # Readings with start <= timestamp < end, oldest first
+        columns = self._flushed(meter_number)
+        if not columns or not columns.rows:
+            return
+        with self._mapped(columns, TIMESTAMP_FILE, "q") as timestamps:
+            first, last = _row_range(timestamps, start, end)
+            stamps = array("q", timestamps[first:last])
+        if first == last:
+            return
+        numeric = {}
+        for name in NUMERIC_FIELDS:
+            with self._mapped(columns, f"{name}.f64", "d") as values:
+                numeric[name] = array("d", values[first:last])
+        codes = {}
+        for name in INTERNED_FIELDS:
+            with self._mapped(columns, f"{name}.u32", "I") as values:
+                codes[name] = array("I", values[first:last])
+        with self._mapped(columns, EXTRA_OFFSETS_FILE, "Q") as offsets:
+            extra_start = offsets[first - 1] if first else 0
+            extra_ends = array("Q", offsets[first:last])
+        with self._mapped(columns, EXTRA_DATA_FILE, "B") as data:
+            extra = bytes(data[extra_start:extra_ends[-1]])
+        strings = columns.strings
+        offset = 0
+        for index, stamp in enumerate(stamps):
+            end_offset = extra_ends[index] - extra_start
+            values = json.loads(extra[offset:end_offset])
+            offset = end_offset
+            values.update({name: numeric[name][index] for name in NUMERIC_FIELDS})
+            values.update({name: strings[codes[name][index]] for name in INTERNED_FIELDS})
+            yield stamp / 1000, MeterData(**values)
+
+    def _columns(self, meter_number: str) -> _MeterColumns:
+        columns = self.meters.get(meter_number)
+        if columns is None:
+            if not METER_NAME.fullmatch(meter_number):
+                raise ValueError(f"Invalid meter number for the local store: {meter_number!r}")
+            with self.lock:
+                columns = self.meters.get(meter_number)
+                if columns is None:
+                    columns = self.meters[meter_number] = _MeterColumns(os.path.join(self.directory, meter_number))
+        return columns
+
+    def _flushed(self, meter_number: str) -> Optional[_MeterColumns]:
+        if meter_number not in self.meters and not os.path.isdir(os.path.join(self.directory, meter_number)):
+            return None
+        columns = self._columns(meter_number)
+        with columns.lock:
+            columns.flush()
+        return columns
+
+    @contextmanager
+    def _mapped(self, columns: _MeterColumns, filename: str, typecode: str):
+        # Only the rows known to be complete are mapped; a concurrent flush may be extending the file
+        size = columns.extra_bytes if filename == EXTRA_DATA_FILE else columns.rows * array(typecode).itemsize
+        if not size:
+            yield memoryview(b"").cast(typecode)
+            return
+        with open(columns._path(filename), "rb") as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            values = view.cast(typecode)
+            try:
+                yield values
+            finally:
+                values.release()
+                view.release()
+
+def _column_file(name: str) -> Tuple[str, str]:
+    if name == "timestamp":
+        return TIMESTAMP_FILE, "q"
+    if name in NUMERIC_FIELDS:
+        return f"{name}.f64", "d"
+    raise ValueError(f"Not a numeric column: {name}")
+
+def _row_range(timestamps, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+    # Timestamps only grow, so both ends of the range are binary searches over the mapped index
+    first = bisect_left(timestamps, _to_ms(start)) if start is not None else 0
+    last = bisect_left(timestamps, _to_ms(end)) if end is not None else len(timestamps)
+    return first, max(first, last)
+
+def _to_ms(timestamp: float) -> int:
+    return int(round(timestamp * 1000))
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+def _truncate(path: str, size: int):
+    if _file_size(path) > size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
\ No newline at end of file
@@ -0,0 +1,40 @@
+import hashlib
+from dataclasses import fields
+from json.encoder import JSONEncoder, c_make_encoder, encode_basestring_ascii
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Optional
+from ekm_meter.domain.models import MeterData
+
+# Output is byte-identical to json.dumps(meter_data.__dict__, sort_keys=True), the historical signing input.
+# json.dumps builds a new encoder on every sort_keys call; this one is built once. Floats go through
+# float.__repr__ (shortest round-trip form), which is what json emits on every Python 3 version.
+if c_make_encoder is not None:
+    _iterencode = c_make_encoder(
+        None, JSONEncoder().default, encode_basestring_ascii, None, ": ", ", ", True, False, True
+    )
+else:
+    _iterencode = JSONEncoder(sort_keys=True).iterencode
+
+class CanonicalEncoder:
+    def __init__(self, field_names: Optional[Iterable[str]] = None):
+        self.all_fields = field_names is None
+        self.field_names = tuple(sorted(
+            field_names if field_names is not None else (field.name for field in fields(MeterData))
+        ))
+        getter = attrgetter(*self.field_names)
+        self.getter = getter if len(self.field_names) > 1 else lambda obj: (getter(obj),)
+
+    def encode(self, meter_data: Any) -> bytes:
+        return "".join(_iterencode(self._as_dict(meter_data), 0)).encode("ascii")
+
+    def digest(self, meter_data: Any) -> bytes:
+        return hashlib.sha256(self.encode(meter_data)).digest()
+
+    def _as_dict(self, meter_data: Any) -> Dict[str, Any]:
+        if self.all_fields:
+            # A plain MeterData already holds exactly the signed fields
+            values = getattr(meter_data, "__dict__", None)
+            if values is not None:
+                return values
+        # Slotted records and field subsets are assembled in the precomputed order
+        return dict(zip(self.field_names, self.getter(meter_data)))
\ No newline at end of file
@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Optional, Tuple
+from ekm_meter.config.settings import settings
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.canonical import CanonicalEncoder
+from ekm_meter.service.hashing import digest_meter_data
+
+class ChangeDetector:
+    def __init__(
+        self,
+        max_meters: Optional[int] = None,
+        heartbeat: Optional[bool] = None,
+        ignored_fields: Optional[Iterable[str]] = None,
+    ):
+        self.max_meters = max_meters or settings.DEDUP_MAX_METERS
+        self.heartbeat = heartbeat if heartbeat is not None else settings.DEDUP_MODE == "heartbeat"
+        ignored = set(ignored_fields if ignored_fields is not None else settings.DEDUP_IGNORE_FIELDS)
+        # Timestamps change on every read, so they are left out of the comparison digest
+        self.encoder = CanonicalEncoder([field.name for field in fields(MeterData) if field.name not in ignored])
+        self.lock = threading.Lock()
+        # meter -> (comparison digest, signed digest) of its last delivered reading
+        self.last_digests: "OrderedDict[str, Tuple[bytes, bytes]]" = OrderedDict()
+        self.pending: Dict[str, Tuple[bytes, MeterData]] = {}
+        self.checked = 0
+        self.changed = 0
+        self.suppressed = 0
+        self.heartbeats = 0
+        self.evictions = 0
+
+    def check(self, meter_number: str, meter_data: MeterData) -> bool:
+        # A changed reading is held as pending; it only becomes the baseline once commit confirms delivery
+        digest = self.encoder.digest(meter_data)
+        with self.lock:
+            self.checked += 1
+            last = self.last_digests.get(meter_number)
+            if last is None or last[0] != digest:
+                self.changed += 1
+                self.pending[meter_number] = (digest, meter_data)
+                return True
+            self.last_digests.move_to_end(meter_number)
+            if self.heartbeat:
+                self.heartbeats += 1
+            else:
+                self.suppressed += 1
+            return False
+
+    def commit(self, meter_number: str):
+        with self.lock:
+            pending = self.pending.pop(meter_number, None)
+        if pending is None:
+            return
+        digest, meter_data = pending
+        # The heartbeat names the signing input of the delivered reading, not the comparison digest
+        signed_digest = digest_meter_data(meter_data)
+        with self.lock:
+            self.last_digests[meter_number] = (digest, signed_digest)
+            self.last_digests.move_to_end(meter_number)
+            if len(self.last_digests) > self.max_meters:
+                self.last_digests.popitem(last=False)
+                self.evictions += 1
+
+    def rollback(self, meter_number: str):
+        # Delivery failed: the next identical reading must still count as changed
+        with self.lock:
+            self.pending.pop(meter_number, None)
+
+    def heartbeat_record(self, meter_number: str, meter_data: MeterData) -> Dict[str, Any]:
+        # Unsigned liveness marker carrying the SHA-256 that the last delivered signature for this meter covers
+        with self.lock:
+            last = self.last_digests.get(meter_number)
+        return {
+            "meter_number": meter_number,
+            "heartbeat": True,
+            "reading_date": meter_data.reading_date,
+            "digest": last[1].hex() if last else "",
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "checked": self.checked,
+                "changed": self.changed,
+                "suppressed": self.suppressed,
+                "heartbeats": self.heartbeats,
+                "signatures_avoided": self.suppressed + self.heartbeats,
+                "uploads_avoided": self.suppressed,
+                "cached_meters": len(self.last_digests),
+                "evictions": self.evictions,
+            }
\ No newline at end of file
@@ -0,0 +1,70 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from ekm_meter.config.settings import settings
+from ekm_meter.domain.models import FetchResult
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+from ekm_meter.utils.jitter import phase_offset
+
+class FleetFetchService:
+    def __init__(
+        self,
+        ekm_repo: EKMAPIRepository,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        jitter_seconds: Optional[float] = None,
+    ):
+        self.ekm_repo = ekm_repo
+        self.concurrency = concurrency or settings.FLEET_CONCURRENCY
+        self.batch_size = batch_size or settings.EKM_BATCH_SIZE
+        self.jitter_seconds = jitter_seconds if jitter_seconds is not None else settings.SCHEDULER_JITTER_SECONDS
+        # Blocking HTTP calls run on a bounded pool so one event loop can drive the whole fleet
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ekm-fetch")
+
+    def fetch_all(self, meter_numbers: List[str]) -> List[FetchResult]:
+        return asyncio.run(self.fetch_all_async(meter_numbers))
+
+    async def fetch_all_async(self, meter_numbers: List[str]) -> List[FetchResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        if self.batch_size <= 1:
+            return await asyncio.gather(*(self._fetch_one(meter_number, semaphore) for meter_number in meter_numbers))
+        chunks = self.ekm_repo.chunk_meter_numbers(meter_numbers, self.batch_size)
+        batches = await asyncio.gather(*(self._fetch_batch(chunk, semaphore) for chunk in chunks))
+        return [result for batch in batches for result in batch]
+
+    async def _fetch_one(self, meter_number: str, semaphore: asyncio.Semaphore) -> FetchResult:
+        await self._wait_for_phase(meter_number)
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            started = time.monotonic()
+            try:
+                meter_data = await loop.run_in_executor(self.executor, self.ekm_repo.fetch_meter_data, meter_number)
+                return FetchResult(meter_number, meter_data=meter_data, elapsed_seconds=time.monotonic() - started)
+            except Exception as e:
+                return FetchResult(meter_number, error=str(e), elapsed_seconds=time.monotonic() - started)
+
+    async def _fetch_batch(self, meter_numbers: List[str], semaphore: asyncio.Semaphore) -> List[FetchResult]:
+        await self._wait_for_phase(meter_numbers[0])
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            started = time.monotonic()
+            try:
+                meters = await loop.run_in_executor(self.executor, self.ekm_repo.fetch_meters_data, meter_numbers)
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                return [FetchResult(meter_number, error=str(e), elapsed_seconds=elapsed) for meter_number in meter_numbers]
+            elapsed = time.monotonic() - started
+            return [
+                FetchResult(meter_number, meter_data=meters[meter_number], elapsed_seconds=elapsed)
+                if meter_number in meters
+                else FetchResult(meter_number, error="Meter missing from batch reply", elapsed_seconds=elapsed)
+                for meter_number in meter_numbers
+            ]
+
+    async def _wait_for_phase(self, meter_number: str):
+        if self.jitter_seconds > 0:
+            await asyncio.sleep(phase_offset(meter_number, self.jitter_seconds))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
\ No newline at end of file
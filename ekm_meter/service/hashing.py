@@ -1,32 +1,152 @@
-import json
 import hashlib
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
+import time
+from typing import Any, Dict, List
 from ekm_meter.config.settings import settings
 from ekm_meter.domain.models import MeterData
+from ekm_meter.service.canonical import CanonicalEncoder
+from ekm_meter.service.merkle import MerkleTree, root_from_audit_path
+from ekm_meter.utils.metrics import SERIALIZE_SECONDS, SIGN_SECONDS, record_error
 
 class HashingService:
-    def __init__(self):
+    def __init__(self, private_key=None):
         self.private_key_path = settings.PRIVATE_KEY_PATH
-        self.private_key = self._load_private_key()
+        # A key handed in was already loaded and checked; the file at the path may have changed since
+        self.private_key = private_key if private_key is not None else self._load_private_key()
+        self.signature_scheme = signature_scheme(self.private_key)
+        self.fingerprint = key_fingerprint(self.private_key)
 
     def _load_private_key(self):
-        with open(self.private_key_path, "rb") as key_file:
-            return serialization.load_pem_private_key(
-                key_file.read(),
-                password=None,
-            )
+        return load_private_key(self.private_key_path)
 
     def hash_meter_data(self, meter_data: MeterData) -> str:
-        # Serialize meter data to JSON string
-        data_str = json.dumps(meter_data.__dict__, sort_keys=True)
         # Hash using SHA-256
-        sha256_hash = hashlib.sha256(data_str.encode("utf-8")).digest()
+        started = time.perf_counter()
+        sha256_hash = digest_meter_data(meter_data)
+        SERIALIZE_SECONDS.observe(time.perf_counter() - started)
         # Sign hash with private key
-        signature = self.private_key.sign(
-            sha256_hash,
+        signature = self._sign(sha256_hash)
+        # Return hex-encoded signature
+        return signature.hex()
+
+    def hash_meter_batch(self, meter_data_list: List[MeterData]) -> List[Dict[str, Any]]:
+        with SERIALIZE_SECONDS.time():
+            digests = [digest_meter_data(meter_data) for meter_data in meter_data_list]
+        tree = MerkleTree(digests)
+        # A single signature over the root covers every reading in the batch
+        root_signature = self._sign(tree.root).hex()
+        return [
+            {
+                "merkle_root": tree.root.hex(),
+                "root_signature": root_signature,
+                "leaf_index": index,
+                "audit_path": tree.audit_path(index),
+            }
+            for index in range(len(meter_data_list))
+        ]
+
+    def _sign(self, message: bytes) -> bytes:
+        started = time.perf_counter()
+        try:
+            signature = sign_message(self.private_key, message)
+        except Exception as e:
+            record_error("sign", e)
+            raise
+        SIGN_SECONDS.observe(time.perf_counter() - started)
+        return signature
+
+# cryptography is imported inside the functions that use it: it is the slowest import in the
+# package, and modules that only serialize or digest readings should not pay for it
+
+def load_private_key(private_key_path: str):
+    with open(private_key_path, "rb") as key_file:
+        return load_private_key_pem(key_file.read())
+
+def load_private_key_pem(pem: bytes):
+    from cryptography.hazmat.primitives import serialization
+
+    return serialization.load_pem_private_key(
+        pem,
+        password=None,
+    )
+
+def private_key_pem(private_key) -> bytes:
+    from cryptography.hazmat.primitives import serialization
+
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+def key_fingerprint(key) -> str:
+    from cryptography.hazmat.primitives import serialization
+
+    # SHA-256 of the public key's SubjectPublicKeyInfo, so private and public halves share one id
+    public_key = key.public_key() if hasattr(key, "public_key") else key
+    der = public_key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+    return hashlib.sha256(der).hexdigest()[:16]
+
+def signature_scheme(key) -> str:
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "rsa-pkcs1v15-sha256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "ed25519"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        return f"ecdsa-{key.curve.name}-sha256"
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+def sign_message(private_key, message: bytes) -> bytes:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa
+    from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(message)
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        # Fixed-width r || s instead of DER: smaller and constant size on the wire
+        r, s = decode_dss_signature(private_key.sign(message, ec.ECDSA(hashes.SHA256())))
+        size = (private_key.curve.key_size + 7) // 8
+        return r.to_bytes(size, "big") + s.to_bytes(size, "big")
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return private_key.sign(
+            message,
             padding.PKCS1v15(),
             hashes.SHA256()
         )
-        # Return hex-encoded signature
-        return signature.hex()
\ No newline at end of file
+    raise ValueError(f"Unsupported key type: {type(private_key).__name__}")
+
+def verify_signature(public_key, signature: bytes, message: bytes) -> bool:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding
+    from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+    try:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, message)
+        elif isinstance(public_key, ec.EllipticCurvePublicKey):
+            size = (public_key.curve.key_size + 7) // 8
+            r, s = int.from_bytes(signature[:size], "big"), int.from_bytes(signature[size:], "big")
+            public_key.verify(encode_dss_signature(r, s), message, ec.ECDSA(hashes.SHA256()))
+        else:
+            public_key.verify(signature, message, padding.PKCS1v15(), hashes.SHA256())
+    except InvalidSignature:
+        return False
+    return True
+
+_canonical_encoder = CanonicalEncoder()
+
+def serialize_meter_data(meter_data: MeterData) -> bytes:
+    # Serialize meter data to canonical JSON bytes
+    return _canonical_encoder.encode(meter_data)
+
+def digest_meter_data(meter_data: MeterData) -> bytes:
+    return _canonical_encoder.digest(meter_data)
+
+def verify_batch_record(public_key, meter_data: MeterData, proof: Dict[str, Any]) -> bool:
+    root = root_from_audit_path(digest_meter_data(meter_data), proof["audit_path"])
+    if root.hex() != proof["merkle_root"]:
+        return False
+    return verify_signature(public_key, bytes.fromhex(proof["root_signature"]), root)
\ No newline at end of file
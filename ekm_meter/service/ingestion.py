@@ -1,18 +1,128 @@
+import gzip
+import json
+import threading
+import time
 import requests
+from typing import Any, Dict, List, Optional, Tuple, Union
 from ekm_meter.config.settings import settings
+from ekm_meter.utils.metrics import INGEST_SECONDS, record_error
+from ekm_meter.utils.resilience import ResiliencePolicy
+
+IngestRecord = Union[str, Dict[str, Any]]
+
+MISSING_ACK = "Missing acknowledgement"
 
 class CloudIngestionService:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, resilience: Optional[ResiliencePolicy] = None):
+        self.http = session if session is not None else requests
+        self.resilience = resilience
         self.ingest_url = settings.CLOUD_INGEST_URL
+        self.ingest_batch_url = settings.CLOUD_INGEST_BATCH_URL
+        self.compression = settings.INGEST_COMPRESSION
+
+    def ingest(self, hashed_data: IngestRecord):
+        started = time.perf_counter()
+        try:
+            reply = self._post_json(self.ingest_url, json=self._to_payload(hashed_data), timeout=10)
+        except Exception as e:
+            record_error("ingest", e)
+            raise RuntimeError(f"Failed to ingest data to cloud: {e}")
+        finally:
+            INGEST_SECONDS.labels("record").observe(time.perf_counter() - started)
+        return reply
 
-    def ingest(self, hashed_data: str):
+    def ingest_batch(self, records: List[IngestRecord]) -> List[Dict[str, Any]]:
+        # Each record carries its position as "id" so acknowledgements can be matched back
+        payload = [dict(self._to_payload(record), id=index) for index, record in enumerate(records)]
+        body = json.dumps({"records": payload}, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        body, encoding = self._compress(body)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        started = time.perf_counter()
         try:
-            response = requests.post(
-                self.ingest_url,
-                json={"hashed_data": hashed_data},
-                timeout=10
-            )
+            reply = self._post_json(self.ingest_batch_url, data=body, headers=headers, timeout=10)
+            if not isinstance(reply, dict) or not isinstance(reply.get("acks", []), list):
+                raise ValueError(f"Unexpected batch reply: {str(reply)[:200]}")
+            acks = {ack.get("id"): ack for ack in reply.get("acks", []) if isinstance(ack, dict)}
+        except Exception as e:
+            record_error("ingest", e)
+            raise RuntimeError(f"Failed to ingest batch to cloud: {e}")
+        finally:
+            INGEST_SECONDS.labels("batch").observe(time.perf_counter() - started)
+        return [
+            acks.get(index, {"id": index, "status": "error", "error": MISSING_ACK})
+            for index in range(len(records))
+        ]
+
+    def _post_json(self, url: str, **kwargs) -> Any:
+        def request():
+            response = self.http.post(url, **kwargs)
             response.raise_for_status()
             return response.json()
-        except Exception as e:
-            raise RuntimeError(f"Failed to ingest data to cloud: {e}")
\ No newline at end of file
+        return self.resilience.call(request) if self.resilience else request()
+
+    @staticmethod
+    def _to_payload(record: IngestRecord) -> Dict[str, Any]:
+        return {"hashed_data": record} if isinstance(record, str) else record
+
+    def _compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        if self.compression == "gzip":
+            return gzip.compress(body, compresslevel=6), "gzip"
+        if self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("INGEST_COMPRESSION=zstd requires the zstandard package")
+            return zstandard.ZstdCompressor().compress(body), "zstd"
+        return body, None
+
+class IngestBatcher:
+    def __init__(
+        self,
+        ingestion_service: CloudIngestionService,
+        max_records: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        linger_seconds: Optional[float] = None,
+    ):
+        self.ingestion_service = ingestion_service
+        self.max_records = max_records or settings.INGEST_BATCH_MAX_RECORDS
+        self.max_bytes = max_bytes or settings.INGEST_BATCH_MAX_BYTES
+        self.linger_seconds = linger_seconds if linger_seconds is not None else settings.INGEST_BATCH_LINGER_SECONDS
+        self.lock = threading.Lock()
+        self.pending: List[IngestRecord] = []
+        self.pending_bytes = 0
+        self.oldest_at = 0.0
+
+    def add(self, record: IngestRecord) -> List[Tuple[IngestRecord, Dict[str, Any]]]:
+        size = len(json.dumps(CloudIngestionService._to_payload(record)))
+        results = []
+        with self.lock:
+            if self.pending and self.pending_bytes + size > self.max_bytes:
+                results.extend(self._send())
+            if not self.pending:
+                self.oldest_at = time.monotonic()
+            self.pending.append(record)
+            self.pending_bytes += size
+            if len(self.pending) >= self.max_records or self.pending_bytes >= self.max_bytes or self._lingered():
+                results.extend(self._send())
+        return results
+
+    def flush_due(self) -> List[Tuple[IngestRecord, Dict[str, Any]]]:
+        with self.lock:
+            return self._send() if self.pending and self._lingered() else []
+
+    def flush(self) -> List[Tuple[IngestRecord, Dict[str, Any]]]:
+        with self.lock:
+            return self._send() if self.pending else []
+
+    def _lingered(self) -> bool:
+        return time.monotonic() - self.oldest_at >= self.linger_seconds
+
+    def _send(self) -> List[Tuple[IngestRecord, Dict[str, Any]]]:
+        records, self.pending, self.pending_bytes = self.pending, [], 0
+        try:
+            acks = self.ingestion_service.ingest_batch(records)
+        except RuntimeError as e:
+            acks = [{"id": index, "status": "error", "error": str(e)} for index in range(len(records))]
+        return list(zip(records, acks))
\ No newline at end of file
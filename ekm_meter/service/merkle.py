@@ -0,0 +1,48 @@
+import hashlib
+from typing import List, Tuple
+
+# Domain separation keeps a leaf from ever being mistaken for an interior node
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+AuditPath = List[Tuple[str, str]]
+
+def leaf_hash(digest: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + digest).digest()
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+class MerkleTree:
+    def __init__(self, digests: List[bytes]):
+        if not digests:
+            raise ValueError("Cannot build a Merkle tree from an empty batch")
+        self.levels = [[leaf_hash(digest) for digest in digests]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                # An unpaired node is promoted unchanged to the next level
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def audit_path(self, leaf_index: int) -> AuditPath:
+        path = []
+        index = leaf_index
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(("L" if sibling < index else "R", level[sibling].hex()))
+            index //= 2
+        return path
+
+def root_from_audit_path(digest: bytes, audit_path: AuditPath) -> bytes:
+    node = leaf_hash(digest)
+    for side, sibling_hex in audit_path:
+        sibling = bytes.fromhex(sibling_hex)
+        node = node_hash(sibling, node) if side == "L" else node_hash(node, sibling)
+    return node
\ No newline at end of file
@@ -0,0 +1,61 @@
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from ekm_meter.config.settings import settings
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.hashing import load_private_key_pem, private_key_pem, serialize_meter_data, sign_message
+from ekm_meter.utils.metrics import SERIALIZE_SECONDS, SIGN_SECONDS, record_error
+
+# Each worker process loads the key once in its initializer and keeps it here
+_worker_private_key = None
+
+def _init_worker(pem: bytes):
+    global _worker_private_key
+    _worker_private_key = load_private_key_pem(pem)
+
+def _sign_serialized(serialized: bytes) -> Tuple[str, float]:
+    started = time.perf_counter()
+    signature = sign_message(_worker_private_key, hashlib.sha256(serialized).digest()).hex()
+    return signature, time.perf_counter() - started
+
+class SignerPool:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        private_key=None,
+        private_key_path: Optional[str] = None,
+    ):
+        self.workers = workers or settings.SIGNER_WORKERS
+        self.chunk_size = chunk_size or settings.SIGNER_CHUNK_SIZE
+        # The key is read here and handed to every worker, so workers started later still sign with the key
+        # the controller loaded, even if the file at PRIVATE_KEY_PATH has been replaced since
+        if private_key is not None:
+            pem = private_key_pem(private_key)
+        else:
+            with open(private_key_path or settings.PRIVATE_KEY_PATH, "rb") as key_file:
+                pem = key_file.read()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(pem,))
+
+    def sign_batch(self, serialized_records: List[bytes]) -> List[str]:
+        # Signatures come back in input order, hex-encoded like HashingService.hash_meter_data
+        try:
+            results = list(self.executor.map(_sign_serialized, serialized_records, chunksize=self.chunk_size))
+        except Exception as e:
+            record_error("sign", e)
+            raise RuntimeError(f"Failed to sign batch: {e}")
+        for _, elapsed in results:
+            SIGN_SECONDS.observe(elapsed)
+        return [signature for signature, _ in results]
+
+    def sign_meter_data(self, meter_data_list: List[MeterData]) -> List[str]:
+        serialized_records = []
+        for meter_data in meter_data_list:
+            started = time.perf_counter()
+            serialized_records.append(serialize_meter_data(meter_data))
+            SERIALIZE_SECONDS.observe(time.perf_counter() - started)
+        return self.sign_batch(serialized_records)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
\ No newline at end of file
@@ -0,0 +1,79 @@
+import hashlib
+import math
+import random
+import time
+from typing import Any, Dict, Optional
+
+MODELS = (("Omnimeter Pulse v.4", 0.6), ("Omnimeter I v.3", 0.25), ("Omnimeter II UL v.3", 0.15))
+FIRMWARES = (("1.0.4", 0.5), ("1.0.3", 0.3), ("1.0.1", 0.2))
+STREETS = ("Main St", "Oak Ave", "Pine Rd", "Maple Dr", "Cedar Ln", "Elm St")
+DAY_SECONDS = 86400
+
+class MeterProfile:
+    def __init__(self, seed: int, meter_number: str):
+        rng = random.Random(f"{seed}:{meter_number}")
+        self.meter_number = meter_number
+        self.model = _weighted(rng, MODELS)
+        self.firmware = _weighted(rng, FIRMWARES)
+        self.address = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}"
+        self.nominal_voltage = rng.choice((120.0, 120.0, 240.0))
+        self.ct_ratio = rng.choice((1.0, 1.0, 200.0, 400.0))
+        self.mean_watts = rng.uniform(200.0, 5000.0)
+        # Never above the mean, so the cumulative counter cannot run backwards
+        self.daily_swing_watts = self.mean_watts * rng.uniform(0.2, 0.9)
+        self.phase_seconds = rng.uniform(0, DAY_SECONDS)
+        self.initial_watt_hours = rng.uniform(0, 5_000_000.0)
+
+    def watt_hours(self, timestamp: float) -> float:
+        # Closed-form integral of mean + swing * sin(...): monotonic and needs no per-meter state
+        t = timestamp + self.phase_seconds
+        omega = 2 * math.pi / DAY_SECONDS
+        joules = self.mean_watts * t + self.daily_swing_watts * (1 - math.cos(omega * t)) / omega
+        return self.initial_watt_hours + joules / 3600
+
+    def watts(self, timestamp: float) -> float:
+        t = timestamp + self.phase_seconds
+        return self.mean_watts + self.daily_swing_watts * math.sin(2 * math.pi * t / DAY_SECONDS)
+
+class MeterSimulator:
+    def __init__(self, seed: int = 1, meter_count: int = 100, first_meter_number: int = 300000000):
+        self.seed = seed
+        self.meter_numbers = [str(first_meter_number + index) for index in range(meter_count)]
+        self.known = set(self.meter_numbers)
+        self.profiles: Dict[str, MeterProfile] = {}
+
+    def profile(self, meter_number: str) -> MeterProfile:
+        profile = self.profiles.get(meter_number)
+        if profile is None:
+            profile = self.profiles[meter_number] = MeterProfile(self.seed, meter_number)
+        return profile
+
+    def reading(self, meter_number: str, timestamp: Optional[float] = None) -> Dict[str, Any]:
+        # Readings advance once per second; the same seed, meter and second always give the same reply
+        second = int(time.time() if timestamp is None else timestamp)
+        profile = self.profile(meter_number)
+        digest = hashlib.sha256(f"{self.seed}:{meter_number}:{second}".encode()).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        watts = max(profile.watts(second) + rng.gauss(0, profile.mean_watts * 0.02), 0.0)
+        voltage = profile.nominal_voltage + rng.gauss(0, profile.nominal_voltage * 0.005)
+        watt_hours = round(profile.watt_hours(second), 1)
+        return {
+            "meter_number": meter_number,
+            "meter_name": meter_number,
+            "meter_data": {"kwh": round(watt_hours / 1000, 2), "ct_ratio": profile.ct_ratio},
+            "meter_day_of_week": time.strftime("%A", time.gmtime(second)),
+            "reading_date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second)),
+            "model": profile.model,
+            "address": profile.address,
+            "firmware": profile.firmware,
+            "total_watt_hour": watt_hours,
+            "voltage": round(voltage, 1),
+            "amps": round(watts / voltage, 2),
+            "total_power_watts": round(watts, 1),
+            "ct_ratio": profile.ct_ratio,
+            "frequency_hz": round(60.0 + rng.gauss(0, 0.01), 2),
+        }
+
+def _weighted(rng: random.Random, choices) -> str:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
\ No newline at end of file
@@ -0,0 +1,222 @@
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+from ekm_meter.simulator.meters import MeterSimulator
+
+FAULTS = ("timeout", "throttle", "server_error", "malformed")
+# Spacing of the past reads served for history requests
+HISTORY_INTERVAL_SECONDS = 60
+
+class FaultInjector:
+    def __init__(
+        self,
+        seed: int = 1,
+        timeout_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        timeout_seconds: float = 15.0,
+        retry_after_seconds: int = 1,
+    ):
+        self.rates = {
+            "timeout": timeout_rate,
+            "throttle": throttle_rate,
+            "server_error": server_error_rate,
+            "malformed": malformed_rate,
+        }
+        self.timeout_seconds = timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def choose(self) -> Optional[str]:
+        with self.lock:
+            roll = self.random.random()
+        for fault in FAULTS:
+            if roll < self.rates[fault]:
+                return fault
+            roll -= self.rates[fault]
+        return None
+
+    def server_error_status(self) -> int:
+        with self.lock:
+            return self.random.choice((500, 502, 503))
+
+class RequestStats:
+    def __init__(self, window_seconds: float = 10.0):
+        self.window_seconds = window_seconds
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.meters_served = 0
+        self.statuses: Counter = Counter()
+        self.faults: Counter = Counter()
+        self.per_second: Counter = Counter()
+        self.recent: deque = deque()
+
+    def record(self, status: int, meters: int, fault: Optional[str]):
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            self.meters_served += meters
+            self.statuses[status] += 1
+            if fault:
+                self.faults[fault] += 1
+            self.per_second[int(now - self.started_at)] += 1
+            self.recent.append(now)
+            while self.recent and self.recent[0] < now - self.window_seconds:
+                self.recent.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and self.recent[0] < now - self.window_seconds:
+                self.recent.popleft()
+            elapsed = max(now - self.started_at, 1e-9)
+            return {
+                "requests": self.requests,
+                "meters_served": self.meters_served,
+                "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+                "faults": dict(self.faults),
+                "mean_requests_per_second": self.requests / elapsed,
+                "recent_requests_per_second": len(self.recent) / min(self.window_seconds, elapsed),
+                "peak_requests_per_second": max(self.per_second.values(), default=0),
+            }
+
+class SimulatorServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fleet and pipeline fetch stages open dozens of connections at once
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address,
+        simulator: MeterSimulator,
+        faults: Optional[FaultInjector] = None,
+        latency_seconds: float = 0.0,
+    ):
+        super().__init__(address, SimulatorHandler)
+        self.simulator = simulator
+        self.faults = faults or FaultInjector()
+        self.latency_seconds = latency_seconds
+        self.stats = RequestStats()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "SimulatorServer":
+        threading.Thread(target=self.serve_forever, name="ekm-simulator", daemon=True).start()
+        return self
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        parts = path.strip("/").split("/")
+        if parts == ["stats"]:
+            self._send(200, json.dumps(self.server.stats.snapshot()).encode("utf-8"))
+            return
+        if len(parts) != 2 or parts[0] != "meters":
+            self._send(404, b'{"error": "not found"}')
+            return
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+        fault = self.server.faults.choose()
+        if fault == "timeout":
+            # Hold the connection past the client's timeout, then drop it
+            time.sleep(self.server.faults.timeout_seconds)
+            self.close_connection = True
+            self.server.stats.record(0, 0, fault)
+            return
+        if fault == "throttle":
+            self.server.stats.record(429, 0, fault)
+            self._send(429, b'{"error": "rate limit exceeded"}', {"Retry-After": str(self.server.faults.retry_after_seconds)})
+            return
+        if fault == "server_error":
+            status = self.server.faults.server_error_status()
+            self.server.stats.record(status, 0, fault)
+            self._send(status, b'{"error": "internal error"}')
+            return
+
+        simulator = self.server.simulator
+        meter_numbers = [number for number in parts[1].split("~") if number in simulator.known]
+        if not meter_numbers:
+            self.server.stats.record(404, 0, fault)
+            self._send(404, b'{"error": "unknown meter"}')
+            return
+        params = parse_qs(query)
+        if "start" in params:
+            readings = [
+                simulator.reading(number, timestamp)
+                for number in meter_numbers
+                for timestamp in _history_timestamps(params)
+            ]
+            body = json.dumps({"reads": readings}).encode("utf-8")
+        else:
+            readings = [simulator.reading(number) for number in meter_numbers]
+            body = json.dumps(readings[0] if len(readings) == 1 else {"meters": readings}).encode("utf-8")
+        if fault == "malformed":
+            body = body[: len(body) // 2]
+        # Counted before replying, so a client that reads /stats right after its request sees it
+        self.server.stats.record(200, len(readings), fault)
+        self._send(200, body)
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _history_timestamps(params: Dict[str, Any]):
+    start = int(params["start"][0])
+    end = int(params.get("end", [time.time()])[0])
+    count = int(params.get("count", ["1000"])[0])
+    first = -(-start // HISTORY_INTERVAL_SECONDS) * HISTORY_INTERVAL_SECONDS
+    return range(first, end, HISTORY_INTERVAL_SECONDS)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve simulated EKM Push 3 meter readings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--meters", type=int, default=10000)
+    parser.add_argument("--first-meter", type=int, default=300000000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = SimulatorServer(
+        (args.host, args.port),
+        MeterSimulator(args.seed, args.meters, args.first_meter),
+        FaultInjector(args.seed, args.timeout_rate, args.throttle_rate, args.server_error_rate, args.malformed_rate),
+        args.latency_ms / 1000,
+    )
+    print(f"Simulating {args.meters} meters on {server.url}/meters/<ids>/ (stats on {server.url}/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,16 @@
+import requests
+from typing import Optional
+from requests.adapters import HTTPAdapter
+from ekm_meter.config.settings import settings
+
+def create_session(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or settings.HTTP_POOL_MAXSIZE,
+        # Block instead of opening throwaway connections past the per-host limit
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
\ No newline at end of file
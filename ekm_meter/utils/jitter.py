@@ -0,0 +1,8 @@
+import hashlib
+
+def phase_offset(key: str, max_jitter_seconds: float) -> float:
+    # Stable per-key offset so a meter always lands at the same point inside the interval
+    if max_jitter_seconds <= 0:
+        return 0.0
+    bucket = int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big")
+    return (bucket % 1_000_000) / 1_000_000 * max_jitter_seconds
\ No newline at end of file
@@ -1,15 +1,140 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.metrics import REGISTRY
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+LOG_RECORDS_DROPPED = REGISTRY.counter("ekm_log_records_dropped_total", "Log records dropped because the log queue was full")
+LOG_RECORDS_SUPPRESSED = REGISTRY.counter("ekm_log_records_suppressed_total", "Repeated log records held back by the rate limit")
+
+# Handler installed on each logger made by setup_logger, so configure_logging can swap it
+_installed: Dict[str, logging.Handler] = {}
+_shared_handler: Optional[logging.Handler] = None
+_level = logging.INFO
+_listener: Optional[QueueListener] = None
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter(
-        "[%(asctime)s] %(levelname)s %(name)s: %(message)s",
-        "%Y-%m-%d %H:%M:%S"
-    )
-    handler.setFormatter(formatter)
+    logger.setLevel(_level)
+    handler = _shared_handler or _stdout_handler("text")
     if not logger.hasHandlers():
         logger.addHandler(handler)
-    return logger
\ No newline at end of file
+        _installed[name] = handler
+    return logger
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"))
+
+class RepeatFilter(logging.Filter):
+    def __init__(self, burst: int, window_seconds: float, clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        # (logger, level, message template) -> window start, records seen, records suppressed
+        self.windows: Dict[Tuple[str, int, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Keyed on the unformatted template, so "Failed to fetch meter %s: %s" for every meter in
+        # an outage counts as one message; INFO and below are never limited
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = self.clock()
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                suppressed = window[2] if window else 0
+                self.windows[key] = [now, 1, 0]
+                if suppressed and isinstance(record.args, tuple):
+                    record.msg = f"{record.msg} (%d similar messages suppressed)"
+                    record.args = record.args + (suppressed,)
+                return True
+            window[1] += 1
+            if window[1] <= self.burst:
+                return True
+            window[2] += 1
+        LOG_RECORDS_SUPPRESSED.inc()
+        return False
+
+class _BackgroundQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record can cross as is and be formatted on the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # A stalled stdout must not stall the extraction loop; losing log lines is the lesser harm
+            LOG_RECORDS_DROPPED.inc()
+
+class _BackgroundQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail when stopping with a full queue
+        self.queue.put(self._sentinel)
+
+def configure_logging(
+    log_format: Optional[str] = None,
+    level: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    queue_size: Optional[int] = None,
+    repeat_burst: Optional[int] = None,
+    repeat_window_seconds: Optional[float] = None,
+) -> logging.Handler:
+    global _shared_handler, _level, _listener
+    log_format = log_format or settings.LOG_FORMAT
+    level = logging.getLevelName((level or settings.LOG_LEVEL).upper())
+    use_queue = use_queue if use_queue is not None else settings.LOG_ASYNC
+    queue_size = queue_size or settings.LOG_QUEUE_SIZE
+    repeat_burst = repeat_burst if repeat_burst is not None else settings.LOG_REPEAT_BURST
+    repeat_window_seconds = repeat_window_seconds or settings.LOG_REPEAT_WINDOW_SECONDS
+
+    stop_logging()
+    handler = _stdout_handler(log_format)
+    if use_queue:
+        _listener = _BackgroundQueueListener(queue.Queue(queue_size), handler)
+        _listener.start()
+        atexit.unregister(stop_logging)
+        atexit.register(stop_logging)
+        handler = _BackgroundQueueHandler(_listener.queue)
+    handler.addFilter(RepeatFilter(repeat_burst, repeat_window_seconds))
+    for name, installed in list(_installed.items()):
+        logger = logging.getLogger(name)
+        logger.removeHandler(installed)
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        _installed[name] = handler
+    _shared_handler, _level = handler, level
+    return handler
+
+def stop_logging():
+    # Drains whatever is still queued before returning
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
+
+def _stdout_handler(log_format: str) -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    return handler
\ No newline at end of file
@@ -0,0 +1,227 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+from ekm_meter.config.settings import settings
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.children: Dict[Tuple[str, ...], "_Metric"] = {}
+
+    def labels(self, *values: str):
+        key = tuple(str(value) for value in values)
+        # Lock-free on the hot path: children are only ever added, under the lock
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self.lock:
+                child = self.children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        return type(self)(self.name, self.documentation)
+
+    def samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        if not self.labelnames:
+            return self._own_samples()
+        with self.lock:
+            children = list(self.children.items())
+        return [
+            (suffix, tuple(zip(self.labelnames, key)) + labels, value)
+            for key, child in children
+            for suffix, labels, value in child._own_samples()
+        ]
+
+    def _own_samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def _own_samples(self):
+        return [("", (), self.value)]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        # Evaluated at scrape time, so nothing is recorded on the hot path
+        self.function = function
+
+    def _own_samples(self):
+        if self.function is None:
+            return [("", (), self.value)]
+        try:
+            return [("", (), float(self.function()))]
+        except Exception:
+            return []
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def _new_child(self):
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def _own_samples(self):
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        samples, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            samples.append(("_bucket", (("le", _format_value(bound)),), cumulative))
+        samples.append(("_sum", (), total))
+        samples.append(("_count", (), cumulative))
+        return samples
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, **kwargs)
+
+    def _register(self, metric_type, name, documentation, labelnames, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_type(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+def exception_name(error: BaseException) -> str:
+    # Services wrap failures in RuntimeError; the root cause says more (ReadTimeout, JSONDecodeError, ...)
+    while error.__cause__ or error.__context__:
+        error = error.__cause__ or error.__context__
+    return type(error).__name__
+
+def start_metrics_server(
+    port: Optional[int] = None, host: Optional[str] = None, registry: MetricsRegistry = REGISTRY
+) -> "ThreadingHTTPServer":
+    # http.server is only needed when the endpoint is enabled; keep it off the import path
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host or settings.METRICS_HOST, port if port is not None else settings.METRICS_PORT), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+FETCH_SECONDS = REGISTRY.histogram("ekm_fetch_seconds", "EKM API request latency")
+SERIALIZE_SECONDS = REGISTRY.histogram("ekm_serialize_seconds", "Canonical serialization and SHA-256 digest latency")
+SIGN_SECONDS = REGISTRY.histogram("ekm_sign_seconds", "Signature latency")
+INGEST_SECONDS = REGISTRY.histogram("ekm_ingest_seconds", "Cloud ingest request latency", ["endpoint"])
+CYCLE_SECONDS = REGISTRY.histogram("ekm_cycle_seconds", "Extraction cycle duration", ["mode"])
+METER_READINGS = REGISTRY.counter("ekm_meter_readings_total", "Meter fetch outcomes", ["meter", "outcome"])
+ERRORS = REGISTRY.counter("ekm_errors_total", "Failures by stage and exception class", ["stage", "exception"])
+QUEUE_DEPTH = REGISTRY.gauge("ekm_queue_depth", "Items waiting in internal queues", ["queue"])
+SCHEDULER_LATENESS_SECONDS = REGISTRY.histogram("ekm_scheduler_lateness_seconds", "Delay between a tick and its dispatch")
+SCHEDULER_MISSED_TICKS = REGISTRY.counter("ekm_scheduler_missed_ticks_total", "Ticks lost to process stalls")
+
+def record_error(stage: str, error: BaseException):
+    ERRORS.labels(stage, exception_name(error)).inc()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Optional
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.logger import setup_logger
+
+logger = setup_logger("EKMProfiler")
+
+# Frames kept per allocation; enough to see which caller of a shared helper is leaking
+TRACEMALLOC_FRAMES = 5
+# Snapshot interval after SIGUSR2 when TRACEMALLOC_EVERY is not set
+DEFAULT_SNAPSHOT_EVERY = 10
+
+class CycleProfiler:
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        profile_cycles: Optional[int] = None,
+        signal_cycles: Optional[int] = None,
+        snapshot_every: Optional[int] = None,
+        keep: Optional[int] = None,
+        label: str = "cycle",
+    ):
+        self.directory = directory or settings.PROFILE_DIR
+        self.signal_cycles = signal_cycles if signal_cycles is not None else settings.PROFILE_SIGNAL_CYCLES
+        self.snapshot_every = snapshot_every if snapshot_every is not None else settings.TRACEMALLOC_EVERY
+        self.keep = keep or settings.PROFILE_KEEP
+        self.label = label
+        self.lock = threading.Lock()
+        # Written from signal handlers, read once per cycle
+        self.profile_remaining = profile_cycles if profile_cycles is not None else settings.PROFILE_CYCLES
+        self.tracing = False
+        self.cycles = 0
+        self.previous_snapshot = None
+        os.makedirs(self.directory, exist_ok=True)
+        if self.snapshot_every > 0:
+            self._start_tracing()
+
+    def wrap(self, cycle: Callable[[], Any]) -> Callable[[], Any]:
+        def profiled_cycle():
+            with self.lock:
+                self.cycles += 1
+                number = self.cycles
+                profile = self.profile_remaining > 0
+                if profile:
+                    self.profile_remaining -= 1
+            try:
+                return self._profile(cycle, number) if profile else cycle()
+            finally:
+                if self.tracing and number % (self.snapshot_every or DEFAULT_SNAPSHOT_EVERY) == 0:
+                    self._snapshot(number)
+        return profiled_cycle
+
+    def request_profile(self, cycles: Optional[int] = None):
+        self.profile_remaining = cycles or self.signal_cycles
+
+    def toggle_tracing(self):
+        if self.tracing:
+            import tracemalloc
+
+            self.tracing = False
+            self.previous_snapshot = None
+            tracemalloc.stop()
+        else:
+            self._start_tracing()
+
+    def install_signal_handlers(self):
+        # SIGUSR1 profiles the next few cycles, SIGUSR2 starts or stops allocation tracking
+        if threading.current_thread() is not threading.main_thread() or not hasattr(signal, "SIGUSR1"):
+            return
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request_profile())
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self.toggle_tracing())
+
+    def _profile(self, cycle: Callable[[], Any], number: int) -> Any:
+        import cProfile
+
+        # Covers the thread running the cycle; work handed to fetch or pipeline worker threads shows up as waits
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return cycle()
+        finally:
+            profiler.disable()
+            path = self._output_path("profile", number, ".prof")
+            try:
+                profiler.dump_stats(path)
+                self._rotate("profile")
+                logger.info("Wrote cycle profile to %s (inspect with python -m pstats)", path)
+            except OSError as e:
+                logger.error("Failed to write cycle profile: %s", e)
+
+    def _start_tracing(self):
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.tracing = True
+
+    def _snapshot(self, number: int):
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        path = self._output_path("heap", number, ".snapshot")
+        try:
+            snapshot.dump(path)
+            self._rotate("heap")
+        except OSError as e:
+            logger.error("Failed to write allocation snapshot: %s", e)
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        logger.info("Wrote allocation snapshot to %s (%.1f MiB traced, peak %.1f MiB)", path, current / 2**20, peak / 2**20)
+        if self.previous_snapshot is not None:
+            for stat in snapshot.compare_to(self.previous_snapshot, "lineno")[:5]:
+                if stat.size_diff > 0:
+                    logger.info("Allocation growth since last snapshot: %s", stat)
+        self.previous_snapshot = snapshot
+
+    def _output_path(self, kind: str, number: int, suffix: str) -> str:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        return os.path.join(self.directory, f"{kind}-{self.label}-{stamp}-{os.getpid()}-{number:06d}{suffix}")
+
+    def _rotate(self, kind: str):
+        # Names sort by time, so the oldest files of this kind go first
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith(f"{kind}-{self.label}-"))
+        for name in names[:-self.keep]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import struct
+import threading
+import time
+from typing import Callable, Optional
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.metrics import REGISTRY
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram("ekm_rate_limit_wait_seconds", "Time spent waiting for an EKM request slot")
+
+# Bucket file layout: available tokens, last refill time (wall clock, shared by every process on the host)
+STATE = struct.Struct(">dd")
+
+def _reserve(tokens: float, updated_at: float, now: float, rate: float, burst: float):
+    # Refill, then take a token even if that drives the balance negative: the deficit is this
+    # caller's place in line, so concurrent callers are handed evenly spaced slots instead of racing
+    elapsed = max(now - updated_at, 0.0)
+    tokens = min(burst, tokens + elapsed * rate) - 1
+    wait = -tokens / rate if tokens < 0 else 0.0
+    return tokens, wait
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.tokens = self.burst
+        self.updated_at = clock()
+
+    def acquire(self) -> float:
+        with self.lock:
+            now = self.clock()
+            self.tokens, wait = _reserve(self.tokens, self.updated_at, now, self.rate_per_second, self.burst)
+            self.updated_at = now
+        return _wait(self.sleep, wait)
+
+    def close(self):
+        # Nothing to release; lets callers close either kind of limiter
+        pass
+
+class FileTokenBucket:
+    def __init__(
+        self,
+        path: str,
+        rate_per_second: float,
+        burst: float,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if fcntl is None:
+            raise RuntimeError("EKM_RATE_LIMIT_FILE needs fcntl file locks, which this platform does not provide")
+        self.path = path
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1.0)
+        self.clock = clock
+        self.sleep = sleep
+        # flock is per open file description, so threads of one process still need their own lock
+        self.lock = threading.Lock()
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def acquire(self) -> float:
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(self.fd, STATE.size, 0)
+                now = self.clock()
+                tokens, updated_at = STATE.unpack(raw) if len(raw) == STATE.size else (self.burst, now)
+                tokens, wait = _reserve(tokens, updated_at, now, self.rate_per_second, self.burst)
+                os.pwrite(self.fd, STATE.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return _wait(self.sleep, wait)
+
+    def close(self):
+        with self.lock:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+
+def _wait(sleep: Callable[[float], None], wait: float) -> float:
+    if wait > 0:
+        sleep(wait)
+    RATE_LIMIT_WAIT_SECONDS.observe(wait)
+    return wait
+
+def create_rate_limiter(
+    per_minute: Optional[float] = None, burst: Optional[float] = None, path: Optional[str] = None
+):
+    per_minute = per_minute if per_minute is not None else settings.EKM_RATE_LIMIT_PER_MINUTE
+    if per_minute <= 0:
+        return None
+    burst = burst if burst is not None else settings.EKM_RATE_LIMIT_BURST
+    path = path if path is not None else settings.EKM_RATE_LIMIT_FILE
+    if path:
+        return FileTokenBucket(path, per_minute / 60, burst)
+    return TokenBucket(per_minute / 60, burst)
\ No newline at end of file
@@ -0,0 +1,223 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+import requests
+from ekm_meter.config.settings import settings
+from ekm_meter.utils.metrics import REGISTRY
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+RETRIES = REGISTRY.counter("ekm_retries_total", "Retried requests", ["endpoint"])
+RETRIES_DENIED = REGISTRY.counter("ekm_retries_denied_total", "Retries refused by budget, breaker or Retry-After", ["endpoint", "reason"])
+BREAKER_STATE = REGISTRY.gauge("ekm_circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ["endpoint"])
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+def rejection_status(error: BaseException) -> Optional[int]:
+    # A 4xx other than 429 means the receiver will never accept the request as sent
+    for cause in (error, error.__cause__, error.__context__):
+        if isinstance(cause, requests.HTTPError) and cause.response is not None:
+            status = cause.response.status_code
+            return status if 400 <= status < 500 and not is_retryable(cause) else None
+    return None
+
+def retry_after_seconds(error: BaseException, now: Optional[float] = None) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - (time.time() if now is None else now), 0.0)
+
+class DecorrelatedJitterBackoff:
+    def __init__(self, base_seconds: float, max_seconds: float, rng: Optional[random.Random] = None):
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.random = rng or random.Random()
+
+    def next_delay(self, previous: float) -> float:
+        # Each delay is drawn from [base, 3 * previous], so clients that failed together spread apart
+        return min(self.max_seconds, self.random.uniform(self.base_seconds, max(previous, self.base_seconds) * 3))
+
+class RetryBudget:
+    def __init__(self, ratio: float, min_per_second: float, clock: Callable[[], float] = time.monotonic):
+        # Every request earns `ratio` of a retry, plus a small floor so low-traffic endpoints can still retry
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = max(min_per_second * 10, 1.0)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.balance = self.capacity
+        self.updated_at = clock()
+
+    def record_request(self):
+        with self.lock:
+            self._refill()
+            self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self.lock:
+            self._refill()
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+    def _refill(self):
+        now = self.clock()
+        self.balance = min(self.capacity, self.balance + (now - self.updated_at) * self.min_per_second)
+        self.updated_at = now
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.opens = 0
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self.clock() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                self.probing = False
+            if self.state == "half_open" and not self.probing:
+                # A single probe request decides whether the host has recovered
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = self.clock()
+                self.probing = False
+
+class ResiliencePolicy:
+    def __init__(
+        self,
+        endpoint: str,
+        max_attempts: Optional[int] = None,
+        backoff: Optional[DecorrelatedJitterBackoff] = None,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.endpoint = endpoint
+        self.max_attempts = max_attempts or settings.RETRY_MAX_ATTEMPTS
+        self.backoff = backoff or DecorrelatedJitterBackoff(settings.RETRY_BASE_SECONDS, settings.RETRY_MAX_SECONDS)
+        self.budget = budget or RetryBudget(settings.RETRY_BUDGET_RATIO, settings.RETRY_BUDGET_MIN_PER_SECOND)
+        self.breaker = breaker or CircuitBreaker(settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_SECONDS)
+        self.sleep = sleep
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.not_before = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        BREAKER_STATE.labels(endpoint).set_function(lambda: BREAKER_STATES[self.breaker.state])
+
+    def call(self, func: Callable[[], T]) -> T:
+        self.budget.record_request()
+        with self.lock:
+            self.calls += 1
+        delay = self.backoff.base_seconds
+        attempt = 1
+        while True:
+            if self.clock() < self.not_before:
+                self._deny("retry_after")
+                raise CircuitOpenError(f"{self.endpoint} asked for a pause that has not yet expired (Retry-After)")
+            if not self.breaker.allow():
+                self._deny("circuit_open")
+                raise CircuitOpenError(f"Circuit breaker open for {self.endpoint}")
+            try:
+                result = func()
+            except Exception as e:
+                if not is_retryable(e):
+                    # The host answered, so this says nothing about its health
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                delay = self._retry_delay(e, attempt, delay)
+                if delay is None:
+                    with self.lock:
+                        self.failures += 1
+                    raise
+                with self.lock:
+                    self.retries += 1
+                RETRIES.labels(self.endpoint).inc()
+                self.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "breaker_state": self.breaker.state,
+                "breaker_opens": self.breaker.opens,
+                "retry_budget": self.budget.balance,
+            }
+
+    def _retry_delay(self, error: BaseException, attempt: int, previous: float) -> Optional[float]:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None and retry_after > self.backoff.max_seconds:
+            # The server asked for a longer pause than one call may wait; every call to the endpoint holds off
+            # until it has passed instead of only this one
+            with self.lock:
+                self.not_before = max(self.not_before, self.clock() + retry_after)
+            self._deny("retry_after")
+            return None
+        if attempt >= self.max_attempts:
+            self._deny("attempts_exhausted")
+            return None
+        delay = self.backoff.next_delay(previous)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if not self.budget.try_spend():
+            self._deny("budget")
+            return None
+        return delay
+
+    def _deny(self, reason: str):
+        RETRIES_DENIED.labels(self.endpoint, reason).inc()
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from ekm_meter.controller.backfill import BackfillCheckpoint, BackfillRunner, WorkUnit, main, parse_time, plan_units
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+from ekm_meter.simulator.meters import MeterSimulator
+from ekm_meter.simulator.server import SimulatorServer
+
+START = 1_767_225_600
+
+class FakeHashingService:
+    fingerprint = "test-key"
+
+    def hash_meter_data(self, meter_data):
+        return f"sig:{meter_data.reading_date}"
+
+class FakeIngestionService:
+    def __init__(self, fail_meter=None):
+        self.fail_meter = fail_meter
+        self.lock = threading.Lock()
+        self.records = []
+
+    def ingest(self, record):
+        if record["meter_number"] == self.fail_meter:
+            raise RuntimeError("Failed to ingest data to cloud: 503")
+        with self.lock:
+            self.records.append(record)
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        server = SimulatorServer(("127.0.0.1", 0), MeterSimulator(seed=1, meter_count=3)).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with patch("ekm_meter.repository.ekm_api.settings") as settings:
+            settings.EKM_API_URL = server.url
+            settings.EKM_METER_NUMBER = "300000000"
+            settings.EKM_API_KEY = "k"
+            self.ekm_repo = EKMAPIRepository()
+        self.server = server
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint_path = os.path.join(directory.name, "checkpoint.json")
+        self.meters = ["300000000", "300000001", "300000002"]
+
+    def run_backfill(self, ingestion_service, reads_per_request=31):
+        # Two hours of one-minute reads in 30-minute windows, each asking for one read more than it holds: 4 units per meter
+        checkpoint = BackfillCheckpoint(self.checkpoint_path, START, START + 7200, 1800)
+        runner = BackfillRunner(
+            self.ekm_repo, FakeHashingService(), ingestion_service, checkpoint, workers=4, reads_per_request=reads_per_request
+        )
+        with patch("ekm_meter.controller.backfill.settings") as settings:
+            settings.INGEST_BATCHING = False
+            return runner.run(plan_units(self.meters, START, START + 7200, 1800))
+
+    def test_failed_units_are_redone_on_resume(self):
+        first = FakeIngestionService(fail_meter="300000001")
+        self.assertEqual(self.run_backfill(first), (8, 4))
+        self.assertEqual(len(first.records), 8 * 30)
+
+        second = FakeIngestionService()
+        self.assertEqual(self.run_backfill(second), (4, 0))
+        self.assertEqual({record["meter_number"] for record in second.records}, {"300000001"})
+        dates = sorted(record["reading_date"] for record in second.records)
+        self.assertEqual((len(dates), dates[0], dates[-1]), (120, "2026-01-01T00:00:00Z", "2026-01-01T01:59:00Z"))
+
+        self.assertEqual(self.run_backfill(FakeIngestionService()), (0, 0))
+        self.assertEqual(self.server.stats.snapshot()["requests"], 16)
+
+    def test_full_reply_is_reported_as_possibly_truncated(self):
+        with self.assertLogs("EKMBackfill", "WARNING") as logs:
+            self.run_backfill(FakeIngestionService(), reads_per_request=30)
+        self.assertEqual(len([line for line in logs.output if "may be incomplete" in line]), 12)
+
+    def test_rerun_without_end_resumes_the_saved_range(self):
+        ends = []
+
+        class RecordingRunner:
+            def __init__(self, ekm_repo, hashing_service, ingestion_service, checkpoint, workers=None):
+                self.checkpoint = checkpoint
+
+            def run(self, units):
+                ends.append(self.checkpoint.job["end"])
+                self.checkpoint.save()
+                return 0, 0
+
+        argv = ["--start", str(START), "--meters", "300000000", "--checkpoint", self.checkpoint_path]
+        with patch("ekm_meter.controller.backfill.configure_logging"), patch(
+            "ekm_meter.controller.backfill.BackfillRunner", RecordingRunner
+        ):
+            with patch("ekm_meter.controller.backfill.time.time", return_value=START + 2000.0):
+                self.assertEqual(main(argv), 0)
+            # Restarted a few seconds later without --end
+            with patch("ekm_meter.controller.backfill.time.time", return_value=START + 2005.0):
+                self.assertEqual(main(argv), 0)
+        self.assertEqual(ends, [START + 2000.0, START + 2000.0])
+
+    def test_checkpoint_tracks_out_of_order_completion(self):
+        checkpoint = BackfillCheckpoint(self.checkpoint_path, START, START + 7200, 1800)
+        for index in (0, 2, 3):
+            checkpoint.mark_done(WorkUnit("300000000", index, 0, 0))
+        checkpoint.save()
+
+        reopened = BackfillCheckpoint(self.checkpoint_path, START, START + 7200, 1800)
+        self.assertEqual([reopened.is_done(WorkUnit("300000000", index, 0, 0)) for index in range(4)], [True, False, True, True])
+        reopened.mark_done(WorkUnit("300000000", 1, 0, 0))
+        self.assertEqual((reopened.through["300000000"], reopened.done["300000000"]), (3, set()))
+        with self.assertRaises(RuntimeError):
+            BackfillCheckpoint(self.checkpoint_path, START, START + 3600, 1800)
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time("2026-01-01T00:00:00Z"), START)
+        self.assertEqual(parse_time("2026-01-01"), START)
+        self.assertEqual(parse_time(str(START)), START)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import dataclasses
+import hashlib
+import json
+import unittest
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.canonical import CanonicalEncoder
+
+class TestCanonicalEncoder(unittest.TestCase):
+    def setUp(self):
+        self.encoder = CanonicalEncoder()
+        self.meter_data = MeterData(
+            meter_name="TestMeter",
+            meter_data={"z": [1, 2.5, None], "a": {"y": True, "b": "café"}},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09",
+            model="Pulse v.4",
+            address="123 \"Main\" St\n☃",
+            firmware="1.0.0",
+            total_watt_hour=123456789.123456789,
+            voltage=120.1,
+            amps=1e-7,
+            total_power_watts=1e22,
+            ct_ratio=-0.0,
+            frequency_hz=60.0
+        )
+
+    def assert_golden(self, meter_data):
+        expected = json.dumps(meter_data.__dict__, sort_keys=True).encode("utf-8")
+        self.assertEqual(self.encoder.encode(meter_data), expected)
+        self.assertEqual(self.encoder.digest(meter_data), hashlib.sha256(expected).digest())
+
+    def test_matches_legacy_json_format(self):
+        self.assert_golden(self.meter_data)
+
+    def test_matches_legacy_format_for_edge_values(self):
+        edge_values = [
+            {"total_watt_hour": float("nan"), "voltage": float("inf"), "amps": float("-inf")},
+            {"total_watt_hour": 0.1 + 0.2, "voltage": 5e-324, "amps": 1.7976931348623157e308},
+            {"model": None, "address": None, "meter_data": None},
+            {"voltage": 120, "amps": True, "meter_data": {}},
+        ]
+        for overrides in edge_values:
+            self.assert_golden(dataclasses.replace(self.meter_data, **overrides))
+
+    def test_field_subset_keeps_sorted_order(self):
+        encoder = CanonicalEncoder(["voltage", "address"])
+        self.assertEqual(encoder.encode(self.meter_data), b'{"address": "123 \\"Main\\" St\\n\\u2603", "voltage": 120.1}')
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from ekm_meter.config.settings import Settings, configure
+from ekm_meter.controller import main
+from ekm_meter.controller.scheduler import FixedRateScheduler
+from ekm_meter.domain.models import MeterData
+from ekm_meter.repository.spool import Spool
+
+def meter_data(meter_number):
+    return MeterData(
+        meter_name=f"Meter{meter_number}",
+        meter_data={"kwh": 100},
+        meter_day_of_week="Monday",
+        reading_date="2026-02-09T00:00:00",
+        model="Pulse v.4",
+        address="123 Main St",
+        firmware="1.0.0",
+        total_watt_hour=1000.0,
+        voltage=120.0,
+        amps=10.0,
+        total_power_watts=1200.0,
+        ct_ratio=1.0,
+        frequency_hz=60.0
+    )
+
+class FakeEKMRepository:
+    # Every meter returns the same reading each cycle; slow meters stall their first fetch
+    def __init__(self, slow=(), delay_seconds=0.0):
+        self.slow = set(slow)
+        self.delay_seconds = delay_seconds
+        self.fetched_at = {}
+
+    def fetch_meter_data(self, meter_number=None):
+        if meter_number in self.slow:
+            self.slow.discard(meter_number)
+            time.sleep(self.delay_seconds)
+        self.fetched_at[meter_number] = time.monotonic()
+        return meter_data(meter_number)
+
+class FakeIngestionService:
+    # Meters in `reject` fail their first upload, as a failed ingest or a rejected ack
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.lock = threading.Lock()
+        self.uploads = []
+        self.batches = []
+
+    def ingest(self, record):
+        if not self._accept(record):
+            raise RuntimeError("Failed to ingest data to cloud: 503")
+
+    def ingest_batch(self, records):
+        with self.lock:
+            self.batches.append((time.monotonic(), [record["meter_number"] for record in records]))
+        return [
+            {"id": index, "status": "ok"} if self._accept(record) else {"id": index, "status": "error", "error": "rejected"}
+            for index, record in enumerate(records)
+        ]
+
+    def _accept(self, record):
+        with self.lock:
+            self.uploads.append(record["meter_number"])
+            if record["meter_number"] in self.reject:
+                self.reject.discard(record["meter_number"])
+                return False
+            return True
+
+class TestController(unittest.TestCase):
+    def run_cycles(self, runner, ekm_repo, ingestion_service, cycles=2, **environ):
+        environ = dict(os.environ, EKM_METER_NUMBERS="1,2", EKM_BATCH_SIZE="1", DEDUP_ENABLED="true", **environ)
+        previous = configure(Settings(environ=environ))
+        self.addCleanup(configure, previous)
+        # Back-to-back cycles instead of waiting for whole-second ticks
+        scheduler = lambda **kwargs: FixedRateScheduler(interval_seconds=0.05, overlap_policy="queue", **kwargs)
+        with patch.object(main, "EKMAPIRepository", return_value=ekm_repo), patch.object(
+            main, "CloudIngestionService", return_value=ingestion_service
+        ), patch.object(main, "FixedRateScheduler", scheduler):
+            runner(max_cycles=cycles)
+
+    def test_pipeline_sends_lingering_partial_batch_and_settles_acks(self):
+        ekm_repo = FakeEKMRepository(slow=["2"], delay_seconds=0.6)
+        ingestion_service = FakeIngestionService(reject=["1"])
+        self.run_cycles(
+            main.run_pipeline_extraction_cycle,
+            ekm_repo,
+            ingestion_service,
+            INGEST_BATCHING="true",
+            INGEST_BATCH_LINGER_SECONDS="0.1",
+            PIPELINE_FETCH_WORKERS="2",
+        )
+        # Meter 1 went out on its own while meter 2 was still being fetched; its rejected ack made
+        # the next cycle upload it again, while meter 2's accepted reading was suppressed
+        self.assertEqual([meters for _, meters in ingestion_service.batches], [["1"], ["2"], ["1"]])
+        self.assertLess(ingestion_service.batches[0][0], ingestion_service.batches[1][0] - 0.3)
+
+    def test_fleet_resends_failed_ingest_and_suppresses_delivered(self):
+        ingestion_service = FakeIngestionService(reject=["1"])
+        self.run_cycles(main.run_fleet_extraction_cycle, FakeEKMRepository(), ingestion_service)
+        self.assertEqual(sorted(ingestion_service.uploads), ["1", "1", "2"])
+
+    def test_fleet_resends_rejected_batch_ack_and_suppresses_delivered(self):
+        ingestion_service = FakeIngestionService(reject=["2"])
+        self.run_cycles(main.run_fleet_extraction_cycle, FakeEKMRepository(), ingestion_service, INGEST_BATCHING="true")
+        self.assertEqual([sorted(meters) for _, meters in ingestion_service.batches], [["1", "2"], ["2"]])
+
+    def test_fleet_spool_append_commits_reading(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.run_cycles(main.run_fleet_extraction_cycle, FakeEKMRepository(), FakeIngestionService(), SPOOL_DIR=tmp.name)
+        # Once a reading is in the spool the replayer owns its delivery; the second cycle must not spool it again
+        spool = Spool(tmp.name)
+        self.addCleanup(spool.close)
+        self.assertEqual(spool.next_seq - 1, 2)
+
+    def test_pipeline_resends_failed_ingest_and_suppresses_delivered(self):
+        ingestion_service = FakeIngestionService(reject=["2"])
+        self.run_cycles(main.run_pipeline_extraction_cycle, FakeEKMRepository(), ingestion_service)
+        self.assertEqual(sorted(ingestion_service.uploads), ["1", "2", "2"])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import dataclasses
+import unittest
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.dedup import ChangeDetector
+from ekm_meter.service.hashing import digest_meter_data
+
+class TestChangeDetector(unittest.TestCase):
+    def setUp(self):
+        self.meter_data = MeterData(
+            meter_name="TestMeter",
+            meter_data={"test": 123},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09T00:00:00",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0
+        )
+
+    def deliver(self, detector, meter_number, meter_data):
+        changed = detector.check(meter_number, meter_data)
+        if changed:
+            detector.commit(meter_number)
+        return changed
+
+    def test_suppresses_repeated_reading_despite_new_timestamp(self):
+        detector = ChangeDetector(max_meters=10, heartbeat=False, ignored_fields=["reading_date"])
+        self.assertTrue(self.deliver(detector, "1", self.meter_data))
+        self.assertFalse(self.deliver(detector, "1", dataclasses.replace(self.meter_data, reading_date="2026-02-09T00:01:00")))
+        self.assertTrue(self.deliver(detector, "1", dataclasses.replace(self.meter_data, total_watt_hour=1000.5)))
+        stats = detector.stats()
+        self.assertEqual(stats["suppressed"], 1)
+        self.assertEqual(stats["signatures_avoided"], 1)
+        self.assertEqual(stats["uploads_avoided"], 1)
+
+    def test_undelivered_reading_is_not_the_baseline(self):
+        detector = ChangeDetector(max_meters=10, heartbeat=False, ignored_fields=["reading_date"])
+        self.assertTrue(detector.check("1", self.meter_data))
+        detector.rollback("1")
+        self.assertTrue(detector.check("1", self.meter_data))
+        # Never confirmed either way, as when signing fails: still not the baseline
+        self.assertTrue(detector.check("1", self.meter_data))
+        detector.commit("1")
+        self.assertFalse(detector.check("1", self.meter_data))
+
+    def test_heartbeat_mode_counts_signatures_but_not_uploads(self):
+        detector = ChangeDetector(max_meters=10, heartbeat=True, ignored_fields=["reading_date"])
+        self.deliver(detector, "1", self.meter_data)
+        later = dataclasses.replace(self.meter_data, reading_date="2026-02-09T00:01:00")
+        self.assertFalse(detector.check("1", later))
+        heartbeat = detector.heartbeat_record("1", later)
+        self.assertTrue(heartbeat["heartbeat"])
+        self.assertEqual(heartbeat["reading_date"], later.reading_date)
+        # Points at the signing input of the delivered reading, timestamp included
+        self.assertEqual(heartbeat["digest"], digest_meter_data(self.meter_data).hex())
+        stats = detector.stats()
+        self.assertEqual((stats["signatures_avoided"], stats["uploads_avoided"]), (1, 0))
+
+    def test_least_recently_seen_meter_is_evicted(self):
+        detector = ChangeDetector(max_meters=2, heartbeat=False, ignored_fields=[])
+        self.deliver(detector, "1", self.meter_data)
+        self.deliver(detector, "2", self.meter_data)
+        self.deliver(detector, "1", self.meter_data)
+        self.deliver(detector, "3", self.meter_data)
+        self.assertEqual(detector.stats()["evictions"], 1)
+        self.assertFalse(self.deliver(detector, "1", self.meter_data))
+        self.assertTrue(self.deliver(detector, "2", self.meter_data))
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+
+def meter_record(meter_number, **overrides):
+    record = {
+        "meter_number": meter_number,
+        "meter_name": f"Meter{meter_number}",
+        "meter_data": {"kwh": 100},
+        "meter_day_of_week": "Monday",
+        "reading_date": "2026-02-09",
+        "model": "Pulse v.4",
+        "address": "123 Main St",
+        "firmware": "1.0.0",
+        "total_watt_hour": 1000.0,
+        "voltage": 120.0,
+        "amps": 10.0,
+        "total_power_watts": 1200.0,
+        "ct_ratio": 1.0,
+        "frequency_hz": 60.0,
+    }
+    record.update(overrides)
+    return record
+
+class TestEKMAPIRepository(unittest.TestCase):
+    @patch("ekm_meter.repository.ekm_api.requests.get")
+    def test_fetch_meters_data_joins_meter_numbers(self, mock_get):
+        mock_get.return_value.json.return_value = {"meters": [meter_record("1"), meter_record("2")]}
+        meters = EKMAPIRepository().fetch_meters_data(["1", "2"])
+        self.assertTrue(mock_get.call_args[0][0].endswith("/meters/1~2/"))
+        self.assertEqual(sorted(meters), ["1", "2"])
+        self.assertEqual(meters["2"].meter_name, "Meter2")
+
+    @patch("ekm_meter.repository.ekm_api.requests.get")
+    def test_fetch_meters_data_keeps_partial_results(self, mock_get):
+        mock_get.return_value.json.return_value = [meter_record("1"), meter_record("3", voltage="n/a")]
+        meters = EKMAPIRepository().fetch_meters_data(["1", "2", "3"])
+        self.assertEqual(list(meters), ["1"])
+
+    @patch("ekm_meter.repository.ekm_api.requests.get")
+    def test_fetch_meters_data_failure(self, mock_get):
+        mock_get.side_effect = Exception("Network error")
+        with self.assertRaises(RuntimeError):
+            EKMAPIRepository().fetch_meters_data(["1", "2"])
+
+    @patch("ekm_meter.repository.ekm_api.requests.get")
+    def test_fetch_meters_data_malformed_response(self, mock_get):
+        for reply in ("Service unavailable", ["not a record"]):
+            mock_get.return_value.json.return_value = reply
+            with self.assertRaises(RuntimeError):
+                EKMAPIRepository().fetch_meters_data(["1", "2"])
+
+    def test_chunk_meter_numbers(self):
+        chunks = list(EKMAPIRepository.chunk_meter_numbers(["1", "2", "3", "4", "5"], 2))
+        self.assertEqual(chunks, [["1", "2"], ["3", "4"], ["5"]])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
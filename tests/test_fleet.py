@@ -0,0 +1,49 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+from ekm_meter.service.fleet import FleetFetchService
+
+class TestFleetFetchService(unittest.TestCase):
+    def setUp(self):
+        self.ekm_repo = MagicMock()
+
+        def fetch_meter_data(meter_number):
+            time.sleep(0.2)
+            if meter_number == "bad":
+                raise RuntimeError("Failed to fetch meter data: timeout")
+            return f"data-{meter_number}"
+
+        self.ekm_repo.fetch_meter_data.side_effect = fetch_meter_data
+        self.fleet_service = FleetFetchService(self.ekm_repo, concurrency=20)
+
+    def tearDown(self):
+        self.fleet_service.close()
+
+    def test_fetch_all_runs_concurrently(self):
+        meter_numbers = [str(n) for n in range(20)]
+        started = time.monotonic()
+        results = self.fleet_service.fetch_all(meter_numbers)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual([r.meter_number for r in results], meter_numbers)
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_fetch_all_reports_per_meter_failure(self):
+        results = self.fleet_service.fetch_all(["1", "bad", "2"])
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertEqual(results[0].meter_data, "data-1")
+        self.assertIn("timeout", results[1].error)
+
+    def test_fetch_all_batches_and_reports_missing_meters(self):
+        self.ekm_repo.chunk_meter_numbers.side_effect = lambda numbers, size: [numbers[:2], numbers[2:]]
+        self.ekm_repo.fetch_meters_data.side_effect = lambda numbers: {n: f"data-{n}" for n in numbers if n != "2"}
+        fleet_service = FleetFetchService(self.ekm_repo, concurrency=4, batch_size=2)
+        try:
+            results = fleet_service.fetch_all(["1", "2", "3"])
+        finally:
+            fleet_service.close()
+        self.assertEqual(self.ekm_repo.fetch_meters_data.call_count, 2)
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertEqual(results[2].meter_data, "data-3")
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,6 +1,13 @@
+import dataclasses
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from ekm_meter.config.settings import settings
 from ekm_meter.domain.models import MeterData
-from ekm_meter.service.hashing import HashingService
+from ekm_meter.service.hashing import HashingService, digest_meter_data, verify_batch_record, verify_signature
 
 class TestHashingService(unittest.TestCase):
     def setUp(self):
@@ -26,5 +33,37 @@ class TestHashingService(unittest.TestCase):
         self.assertIsInstance(hashed, str)
         self.assertTrue(len(hashed) > 0)
 
+    def test_hash_meter_batch_proofs_verify_individually(self):
+        batch = [dataclasses.replace(self.meter_data, total_watt_hour=1000.0 + n) for n in range(5)]
+        proofs = self.hashing_service.hash_meter_batch(batch)
+        self.assertEqual(len({proof["root_signature"] for proof in proofs}), 1)
+        public_key = self.hashing_service.private_key.public_key()
+        for meter_data, proof in zip(batch, proofs):
+            self.assertTrue(verify_batch_record(public_key, meter_data, proof))
+        self.assertFalse(verify_batch_record(public_key, batch[0], proofs[1]))
+
+    def test_signing_scheme_follows_key_type(self):
+        keys = {
+            "ed25519": (ed25519.Ed25519PrivateKey.generate(), 64),
+            "ecdsa-secp256r1-sha256": (ec.generate_private_key(ec.SECP256R1()), 64),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for scheme, (private_key, signature_size) in keys.items():
+                path = os.path.join(directory, f"{scheme}.pem")
+                with open(path, "wb") as f:
+                    f.write(private_key.private_bytes(
+                        serialization.Encoding.PEM,
+                        serialization.PrivateFormat.PKCS8,
+                        serialization.NoEncryption(),
+                    ))
+                with patch.object(settings, "PRIVATE_KEY_PATH", path):
+                    hashing_service = HashingService()
+                self.assertEqual(hashing_service.signature_scheme, scheme)
+                signature = bytes.fromhex(hashing_service.hash_meter_data(self.meter_data))
+                self.assertEqual(len(signature), signature_size)
+                public_key = private_key.public_key()
+                self.assertTrue(verify_signature(public_key, signature, digest_meter_data(self.meter_data)))
+                self.assertFalse(verify_signature(public_key, signature, b"tampered"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,8 @@
+import gzip
+import json
 import unittest
-from unittest.mock import patch
-from ekm_meter.service.ingestion import CloudIngestionService
+from unittest.mock import MagicMock, patch
+from ekm_meter.service.ingestion import CloudIngestionService, IngestBatcher
 
 class TestCloudIngestionService(unittest.TestCase):
     @patch("ekm_meter.service.ingestion.requests.post")
@@ -18,5 +20,64 @@ class TestCloudIngestionService(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             ingestion_service.ingest("test_hash")
 
+    def test_ingest_uses_shared_session(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {"result": "success"}
+        ingestion_service = CloudIngestionService(session)
+        self.assertEqual(ingestion_service.ingest("test_hash"), {"result": "success"})
+        session.post.assert_called_once()
+
+    def test_ingest_batch_maps_acks_to_records(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {"acks": [{"id": 1, "status": "ok"}, {"id": 0, "status": "error"}]}
+        ingestion_service = CloudIngestionService(session)
+        acks = ingestion_service.ingest_batch(["a", "b", {"meter_number": "3", "hashed_data": "c"}])
+        self.assertEqual([ack["status"] for ack in acks], ["error", "ok", "error"])
+        self.assertEqual(acks[2]["error"], "Missing acknowledgement")
+        kwargs = session.post.call_args.kwargs
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        records = json.loads(gzip.decompress(kwargs["data"]))["records"]
+        self.assertEqual(records[2], {"meter_number": "3", "hashed_data": "c", "id": 2})
+
+    def test_ingest_batch_rejects_unexpected_reply(self):
+        session = MagicMock()
+        for reply in (["ok"], {"acks": "ok"}):
+            session.post.return_value.json.return_value = reply
+            with self.assertRaises(RuntimeError):
+                CloudIngestionService(session).ingest_batch(["a"])
+
+class TestIngestBatcher(unittest.TestCase):
+    def setUp(self):
+        self.ingestion_service = MagicMock()
+        self.ingestion_service.ingest_batch.side_effect = lambda records: [
+            {"id": index, "status": "ok"} for index in range(len(records))
+        ]
+
+    def test_flushes_on_record_count(self):
+        batcher = IngestBatcher(self.ingestion_service, max_records=2, max_bytes=10000, linger_seconds=60)
+        self.assertEqual(batcher.add("a"), [])
+        results = batcher.add("b")
+        self.assertEqual([record for record, ack in results], ["a", "b"])
+        self.assertEqual(batcher.flush(), [])
+
+    def test_flushes_before_exceeding_byte_limit(self):
+        batcher = IngestBatcher(self.ingestion_service, max_records=100, max_bytes=40, linger_seconds=60)
+        batcher.add("a" * 10)
+        results = batcher.add("b" * 10)
+        self.assertEqual([record for record, ack in results], ["a" * 10])
+        self.assertEqual([record for record, ack in batcher.flush()], ["b" * 10])
+
+    def test_flush_due_after_linger(self):
+        batcher = IngestBatcher(self.ingestion_service, max_records=100, max_bytes=10000, linger_seconds=0)
+        self.assertEqual(len(batcher.add("a")), 1)
+        self.assertEqual(batcher.flush_due(), [])
+
+    def test_failed_batch_marks_every_record(self):
+        self.ingestion_service.ingest_batch.side_effect = RuntimeError("Failed to ingest batch to cloud: 503")
+        batcher = IngestBatcher(self.ingestion_service, max_records=100, max_bytes=10000, linger_seconds=60)
+        batcher.add("a")
+        batcher.add("b")
+        self.assertEqual([ack["status"] for record, ack in batcher.flush()], ["error", "error"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
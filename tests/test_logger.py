@@ -0,0 +1,56 @@
+import io
+import json
+import logging
+import queue
+import unittest
+from unittest.mock import patch
+from ekm_meter.utils.logger import LOG_RECORDS_DROPPED, RepeatFilter, _BackgroundQueueHandler, configure_logging, setup_logger, stop_logging
+
+def make_record(msg, *args, level=logging.ERROR):
+    return logging.LogRecord("EKMTest", level, __file__, 1, msg, args, None)
+
+class TestRepeatFilter(unittest.TestCase):
+    def test_same_template_is_limited_per_window(self):
+        now = [0.0]
+        repeat_filter = RepeatFilter(burst=2, window_seconds=60, clock=lambda: now[0])
+        allowed = [repeat_filter.filter(make_record("Failed to fetch meter %s: %s", n, "timeout")) for n in range(5)]
+        self.assertEqual(allowed, [True, True, False, False, False])
+        self.assertTrue(repeat_filter.filter(make_record("Other error: %s", "x")))
+        self.assertTrue(all(repeat_filter.filter(make_record("Cycle done", level=logging.INFO)) for _ in range(5)))
+
+        now[0] = 61.0
+        record = make_record("Failed to fetch meter %s: %s", 5, "timeout")
+        self.assertTrue(repeat_filter.filter(record))
+        self.assertEqual(record.getMessage(), "Failed to fetch meter 5: timeout (3 similar messages suppressed)")
+
+class TestConfigureLogging(unittest.TestCase):
+    def tearDown(self):
+        stop_logging()
+        configure_logging(log_format="text", level="INFO", use_queue=False, repeat_burst=0, repeat_window_seconds=60)
+
+    def test_queue_listener_writes_json_lines(self):
+        stdout = io.StringIO()
+        # Not propagating keeps a handler on the root logger (pytest adds one) from hiding this logger from setup_logger
+        logging.getLogger("EKMLoggerTest").propagate = False
+        with patch("sys.stdout", stdout):
+            logger = setup_logger("EKMLoggerTest")
+            configure_logging(log_format="json", level="INFO", use_queue=True, queue_size=100, repeat_burst=1, repeat_window_seconds=60)
+            self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+            logger.debug("not enabled %s", object())
+            logger.info("Signed %d records with key %s", 3, "abc")
+            for n in range(3):
+                logger.error("Failed to fetch meter %s: %s", n, "timeout")
+            stop_logging()
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([line["message"] for line in lines], ["Signed 3 records with key abc", "Failed to fetch meter 0: timeout"])
+        self.assertEqual((lines[1]["level"], lines[1]["logger"]), ("ERROR", "EKMLoggerTest"))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = _BackgroundQueueHandler(queue.Queue(1))
+        dropped = LOG_RECORDS_DROPPED.value
+        for n in range(3):
+            handler.handle(make_record("line %d", n, level=logging.INFO))
+        self.assertEqual(LOG_RECORDS_DROPPED.value, dropped + 2)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,23 @@
+import hashlib
+import unittest
+from ekm_meter.service.merkle import MerkleTree, root_from_audit_path
+
+class TestMerkleTree(unittest.TestCase):
+    def test_every_leaf_proves_inclusion(self):
+        for size in range(1, 18):
+            digests = [hashlib.sha256(str(n).encode()).digest() for n in range(size)]
+            tree = MerkleTree(digests)
+            for index, digest in enumerate(digests):
+                self.assertEqual(root_from_audit_path(digest, tree.audit_path(index)), tree.root)
+
+    def test_wrong_leaf_does_not_match_root(self):
+        digests = [hashlib.sha256(str(n).encode()).digest() for n in range(5)]
+        tree = MerkleTree(digests)
+        self.assertNotEqual(root_from_audit_path(digests[1], tree.audit_path(2)), tree.root)
+
+    def test_empty_batch_rejected(self):
+        with self.assertRaises(ValueError):
+            MerkleTree([])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import unittest
+import urllib.request
+from unittest.mock import MagicMock
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+from ekm_meter.utils.metrics import METER_READINGS, MetricsRegistry, exception_name, start_metrics_server
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.labels("fetch").observe(value)
+        text = registry.render()
+        self.assertIn("# TYPE latency_seconds histogram", text)
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{stage="fetch",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_count{stage="fetch"} 4', text)
+        self.assertIn('latency_seconds_sum{stage="fetch"} 6.05', text)
+
+    def test_counters_and_gauges(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ["exception"]).labels('Bad"Value').inc(2)
+        registry.gauge("queue_depth", "Depth", ["queue"]).labels("spool").set_function(lambda: 7)
+        self.assertIs(registry.counter("errors_total", "Errors", ["exception"]), registry.metrics["errors_total"])
+        text = registry.render()
+        self.assertIn('errors_total{exception="Bad\\"Value"} 2', text)
+        self.assertIn('queue_depth{queue="spool"} 7', text)
+        with self.assertRaises(ValueError):
+            registry.gauge("errors_total", "Errors")
+
+    def test_exception_name_uses_root_cause(self):
+        try:
+            try:
+                raise TimeoutError("slow")
+            except Exception as e:
+                raise RuntimeError(f"Failed to fetch meter data: {e}")
+        except RuntimeError as e:
+            self.assertEqual(exception_name(e), "TimeoutError")
+
+    def test_repository_counts_outcomes_per_meter(self):
+        session = MagicMock()
+        session.get.side_effect = ConnectionError("down")
+        before = METER_READINGS.labels("metrics-test", "error").value
+        with self.assertRaises(RuntimeError):
+            EKMAPIRepository(session).fetch_meter_data("metrics-test")
+        self.assertEqual(METER_READINGS.labels("metrics-test", "error").value, before + 1)
+
+    def test_endpoint_serves_text_format(self):
+        registry = MetricsRegistry()
+        registry.counter("cycles_total", "Cycles").inc()
+        server = start_metrics_server(port=0, host="127.0.0.1", registry=registry)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                self.assertIn("cycles_total 1", response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import dataclasses
+import unittest
+from ekm_meter.domain.models import MeterBatch, MeterData, SlottedMeterData
+from ekm_meter.service.hashing import digest_meter_data
+
+class TestMeterBatch(unittest.TestCase):
+    def setUp(self):
+        template = MeterData(
+            meter_name="TestMeter",
+            meter_data={"test": 123},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0
+        )
+        self.records = [
+            dataclasses.replace(template, total_watt_hour=1000.0 + n, firmware=f"1.0.{n % 2}", address=None if n == 3 else template.address)
+            for n in range(6)
+        ]
+
+    def test_round_trip_to_meter_data(self):
+        batch = MeterBatch.from_records(self.records)
+        self.assertEqual(len(batch), 6)
+        self.assertEqual(batch.to_records(), self.records)
+        self.assertEqual(batch[-1], self.records[-1])
+        self.assertEqual(list(batch.column("total_watt_hour")), [1000.0 + n for n in range(6)])
+
+    def test_repeated_strings_are_interned(self):
+        batch = MeterBatch.from_records(self.records)
+        self.assertEqual(sorted(s for s in batch.strings if s), sorted({
+            "TestMeter", "Monday", "Pulse v.4", "123 Main St", "1.0.0", "1.0.1"
+        }))
+
+    def test_slotted_records_sign_identically(self):
+        slotted = MeterBatch.from_records(self.records).to_records(SlottedMeterData)
+        self.assertFalse(hasattr(slotted[0], "__dict__"))
+        self.assertEqual(
+            [digest_meter_data(record) for record in slotted],
+            [digest_meter_data(record) for record in self.records],
+        )
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
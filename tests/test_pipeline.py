@@ -0,0 +1,78 @@
+import threading
+import time
+import unittest
+from ekm_meter.controller.pipeline import Pipeline
+
+class TestPipeline(unittest.TestCase):
+    def test_items_flow_through_all_stages(self):
+        results = []
+        lock = threading.Lock()
+
+        def collect(item):
+            with lock:
+                results.append(item)
+
+        pipeline = Pipeline(queue_size=4).add_stage("double", lambda n: n * 2, 3).add_stage("collect", collect, 2)
+        pipeline.start()
+        try:
+            for n in range(50):
+                pipeline.submit(n)
+            pipeline.join()
+        finally:
+            pipeline.stop()
+        self.assertEqual(sorted(results), [n * 2 for n in range(50)])
+        self.assertEqual(pipeline.stats()["double"]["processed"], 50)
+
+    def test_stage_errors_are_counted_and_dropped(self):
+        def fail_on_odd(n):
+            if n % 2:
+                raise RuntimeError("Failed to fetch meter data: timeout")
+            return n
+
+        pipeline = Pipeline(queue_size=4).add_stage("fetch", fail_on_odd, 2).add_stage("ingest", lambda n: None, 1)
+        pipeline.start()
+        try:
+            for n in range(10):
+                pipeline.submit(n)
+            pipeline.join()
+        finally:
+            pipeline.stop()
+        stats = pipeline.stats()
+        self.assertEqual(stats["fetch"]["errors"], 5)
+        self.assertEqual(stats["ingest"]["processed"], 5)
+
+    def test_slow_ingest_applies_backpressure_to_fetch(self):
+        release = threading.Event()
+        pipeline = (
+            Pipeline(queue_size=2)
+            .add_stage("fetch", lambda n: n, 1)
+            .add_stage("ingest", lambda n: release.wait(), 1)
+        )
+        pipeline.start()
+        submitter = threading.Thread(target=lambda: [pipeline.submit(n) for n in range(20)])
+        submitter.start()
+        time.sleep(0.2)
+        stats = pipeline.stats()
+        # One item in the ingest worker, two queued for it, one blocked in fetch, two queued for fetch
+        self.assertLessEqual(stats["fetch"]["processed"], 4)
+        self.assertTrue(submitter.is_alive())
+        release.set()
+        submitter.join()
+        pipeline.join()
+        pipeline.stop()
+        self.assertEqual(pipeline.stats()["ingest"]["processed"], 20)
+
+    def test_join_times_out_while_items_are_in_flight(self):
+        release = threading.Event()
+        pipeline = Pipeline(queue_size=2).add_stage("fetch", lambda n: n, 1).add_stage("ingest", lambda n: release.wait(), 1)
+        pipeline.start()
+        try:
+            pipeline.submit(1)
+            self.assertFalse(pipeline.join(timeout=0.05))
+            release.set()
+            self.assertTrue(pipeline.join(timeout=5))
+        finally:
+            pipeline.stop()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from ekm_meter.utils.profiling import CycleProfiler
+
+class TestCycleProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(tracemalloc.stop)
+
+    def files(self, kind):
+        return sorted(name for name in os.listdir(self.tmp.name) if name.startswith(kind))
+
+    def test_profiles_requested_cycles_and_rotates(self):
+        profiler = CycleProfiler(self.tmp.name, profile_cycles=2, signal_cycles=1, snapshot_every=0, keep=1)
+        cycle = profiler.wrap(lambda: sorted(range(1000)))
+        for _ in range(3):
+            cycle()
+        profiles = self.files("profile-")
+        self.assertEqual(len(profiles), 1)
+        self.assertTrue(profiles[0].endswith("000002.prof"))
+        stats = pstats.Stats(os.path.join(self.tmp.name, profiles[0]))
+        self.assertTrue(any(function[2] == "<lambda>" for function in stats.stats))
+
+        profiler.request_profile()
+        cycle()
+        self.assertTrue(self.files("profile-")[0].endswith("000004.prof"))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_allocation_snapshots_every_n_cycles(self):
+        profiler = CycleProfiler(self.tmp.name, profile_cycles=0, snapshot_every=2, keep=5)
+        self.assertTrue(tracemalloc.is_tracing())
+        leak = []
+        cycle = profiler.wrap(lambda: leak.append(bytearray(100000)))
+        for _ in range(4):
+            cycle()
+        self.assertEqual(len(self.files("heap-")), 2)
+        self.assertEqual(self.files("profile-"), [])
+        profiler.toggle_tracing()
+        self.assertFalse(tracemalloc.is_tracing())
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
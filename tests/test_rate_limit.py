@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from ekm_meter.controller.main import run_extraction_cycle
+from ekm_meter.utils.rate_limit import FileTokenBucket, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_evenly_spaced_slots(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_second=2.0, burst=3, clock=clock, sleep=lambda seconds: None)
+        waits = [bucket.acquire() for _ in range(6)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertEqual(waits[3:], [0.5, 1.0, 1.5])
+        clock.now += 10
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_file_bucket_is_shared_between_handles(self):
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bucket")
+            first = FileTokenBucket(path, rate_per_second=1.0, burst=2, clock=clock, sleep=lambda seconds: None)
+            second = FileTokenBucket(path, rate_per_second=1.0, burst=2, clock=clock, sleep=lambda seconds: None)
+            try:
+                self.assertEqual(first.acquire(), 0.0)
+                self.assertEqual(second.acquire(), 0.0)
+                self.assertEqual(first.acquire(), 1.0)
+                self.assertEqual(second.acquire(), 2.0)
+            finally:
+                first.close()
+                second.close()
+
+    def test_controller_closes_its_limiter(self):
+        # Every reload builds a new limiter; the old one's file must not stay open
+        with tempfile.TemporaryDirectory() as directory:
+            bucket = FileTokenBucket(os.path.join(directory, "bucket"), rate_per_second=1.0, burst=1)
+            with patch("ekm_meter.controller.main.create_rate_limiter", return_value=bucket):
+                run_extraction_cycle(max_cycles=0)
+            self.assertIsNone(bucket.fd)
+            bucket.close()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import random
+import unittest
+import requests
+from ekm_meter.utils.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DecorrelatedJitterBackoff,
+    ResiliencePolicy,
+    RetryBudget,
+    retry_after_seconds,
+)
+
+def http_error(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+def replay(outcomes):
+    def request():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return request
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestResiliencePolicy(unittest.TestCase):
+    def policy(self, max_attempts=3, clock=None):
+        clock = clock or FakeClock()
+        self.sleeps = []
+        return ResiliencePolicy(
+            "test",
+            max_attempts=max_attempts,
+            backoff=DecorrelatedJitterBackoff(0.5, 10.0, random.Random(1)),
+            budget=RetryBudget(0.2, 1.0, clock),
+            breaker=CircuitBreaker(3, 30.0, clock),
+            sleep=self.sleeps.append,
+            clock=clock,
+        )
+
+    def test_backoff_stays_within_bounds(self):
+        backoff = DecorrelatedJitterBackoff(0.5, 10.0, random.Random(1))
+        delay = 0.5
+        for _ in range(50):
+            delay = backoff.next_delay(delay)
+            self.assertTrue(0.5 <= delay <= 10.0)
+
+    def test_retries_transient_failures_then_succeeds(self):
+        policy = self.policy()
+        self.assertEqual(policy.call(replay([http_error(503), requests.ConnectionError("reset"), "ok"])), "ok")
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(policy.stats()["retries"], 2)
+
+    def test_client_errors_are_not_retried(self):
+        policy = self.policy()
+        with self.assertRaises(requests.HTTPError):
+            policy.call(replay([http_error(404)]))
+        self.assertEqual(self.sleeps, [])
+
+    def test_retry_after_is_honoured(self):
+        self.assertEqual(retry_after_seconds(http_error(429, "7")), 7.0)
+        self.assertEqual(retry_after_seconds(http_error(429, "Wed, 21 Oct 2015 07:28:05 GMT"), now=1445412480.0), 5.0)
+        policy = self.policy()
+        policy.call(replay([http_error(429, "7"), "ok"]))
+        self.assertGreaterEqual(self.sleeps[0], 7.0)
+        with self.assertRaises(requests.HTTPError):
+            policy.call(replay([http_error(429, "60")]))
+
+    def test_long_retry_after_holds_off_the_whole_endpoint(self):
+        clock = FakeClock()
+        policy = self.policy(clock=clock)
+        with self.assertRaises(requests.HTTPError):
+            policy.call(replay([http_error(429, "60")]))
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            policy.call(lambda: calls.append(1))
+        self.assertEqual(calls, [])
+        clock.now += 60
+        self.assertIsNone(policy.call(lambda: calls.append(1)))
+        self.assertEqual(calls, [1])
+
+    def test_budget_limits_retries(self):
+        clock = FakeClock()
+        budget = RetryBudget(0.2, 1.0, clock)
+        spent = sum(budget.try_spend() for _ in range(20))
+        self.assertEqual(spent, 10)
+        clock.now += 2
+        self.assertTrue(budget.try_spend())
+
+    def test_breaker_opens_and_probes(self):
+        clock = FakeClock()
+        policy = self.policy(max_attempts=1, clock=clock)
+        for _ in range(3):
+            with self.assertRaises(requests.HTTPError):
+                policy.call(replay([http_error(503)]))
+        self.assertEqual(policy.stats()["breaker_state"], "open")
+        calls = []
+        with self.assertRaises(CircuitOpenError):
+            policy.call(lambda: calls.append(1))
+        self.assertEqual(calls, [])
+        clock.now += 30
+        self.assertIsNone(policy.call(lambda: calls.append(1)))
+        self.assertEqual(policy.stats()["breaker_state"], "closed")
+        self.assertEqual(policy.stats()["breaker_opens"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+from ekm_meter.controller.scheduler import FixedRateScheduler
+from ekm_meter.utils.jitter import phase_offset
+
+class FakeClock:
+    def __init__(self, now: float, stall_on_wait: int, stall_seconds: float):
+        self.now = now
+        self.waits = 0
+        self.stall_on_wait = stall_on_wait
+        self.stall_seconds = stall_seconds
+
+    def time(self) -> float:
+        return self.now
+
+    def wait(self, delay: float) -> bool:
+        # Stands in for the scheduler's stop event; one wait oversleeps to simulate a stalled process
+        self.waits += 1
+        self.now += delay + (self.stall_seconds if self.waits == self.stall_on_wait else 0)
+        return False
+
+    def is_set(self) -> bool:
+        return False
+
+class TestFixedRateScheduler(unittest.TestCase):
+    def test_ticks_align_to_wall_clock_multiples(self):
+        scheduler = FixedRateScheduler(interval_seconds=0.05, overlap_policy="queue")
+        fired = []
+        scheduler.run(lambda: fired.append(time.time()), max_ticks=4)
+        self.assertEqual(len(fired), 4)
+        for fired_at in fired:
+            self.assertLess(fired_at % 0.05, 0.04)
+        self.assertEqual(scheduler.stats()["ticks"], 4)
+        self.assertGreaterEqual(scheduler.stats()["max_lateness_seconds"], 0.0)
+
+    def test_next_tick_honours_phase(self):
+        scheduler = FixedRateScheduler(interval_seconds=60, phase_seconds=15, overlap_policy="skip")
+        self.assertEqual(scheduler.next_tick(120.0), 135.0)
+        self.assertEqual(scheduler.next_tick(135.0), 195.0)
+
+    def test_skip_policy_counts_overlapping_ticks(self):
+        scheduler = FixedRateScheduler(interval_seconds=0.05, overlap_policy="skip")
+        runs = []
+        scheduler.run(lambda: (runs.append(1), time.sleep(0.12)), max_ticks=6)
+        stats = scheduler.stats()
+        self.assertGreater(stats["skipped_ticks"], 0)
+        self.assertEqual(len(runs) + stats["skipped_ticks"], 6)
+
+    def test_concurrent_policy_overlaps_cycles(self):
+        scheduler = FixedRateScheduler(interval_seconds=0.05, overlap_policy="concurrent")
+        peak = {"active": 0, "max": 0}
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                peak["active"] += 1
+                peak["max"] = max(peak["max"], peak["active"])
+            time.sleep(0.12)
+            with lock:
+                peak["active"] -= 1
+
+        scheduler.run(job, max_ticks=4)
+        time.sleep(0.15)
+        self.assertGreater(peak["max"], 1)
+
+    def test_missed_ticks_are_counted(self):
+        clock = FakeClock(100.0, stall_on_wait=2, stall_seconds=35)
+        scheduler = FixedRateScheduler(interval_seconds=10, overlap_policy="queue", clock=clock.time)
+        scheduler.stopping = clock
+        fired = []
+        scheduler.run(lambda: fired.append(clock.now), max_ticks=3)
+        stats = scheduler.stats()
+        self.assertEqual(stats["missed_ticks"], 3)
+        self.assertEqual(stats["ticks"], 3)
+        self.assertAlmostEqual(stats["max_lateness_seconds"], 5.0)
+
+    def test_phase_offset_is_stable_and_bounded(self):
+        self.assertEqual(phase_offset("300016966", 30), phase_offset("300016966", 30))
+        self.assertTrue(0 <= phase_offset("300016966", 30) < 30)
+        self.assertEqual(phase_offset("300016966", 0), 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
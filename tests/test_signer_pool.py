@@ -0,0 +1,52 @@
+import dataclasses
+import unittest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+from ekm_meter.domain.models import MeterData
+from ekm_meter.service.hashing import HashingService, digest_meter_data
+from ekm_meter.service.signer_pool import SignerPool
+from ekm_meter.utils.metrics import SERIALIZE_SECONDS, SIGN_SECONDS
+
+class TestSignerPool(unittest.TestCase):
+    def setUp(self):
+        self.signer_pool = SignerPool(workers=2, chunk_size=3)
+        template = MeterData(
+            meter_name="TestMeter",
+            meter_data={"test": 123},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0
+        )
+        self.batch = [dataclasses.replace(template, total_watt_hour=1000.0 + n) for n in range(10)]
+
+    def tearDown(self):
+        self.signer_pool.shutdown()
+
+    def test_signatures_returned_in_order(self):
+        signatures = self.signer_pool.sign_meter_data(self.batch)
+        public_key = HashingService().private_key.public_key()
+        self.assertEqual(len(signatures), len(self.batch))
+        for meter_data, signature in zip(self.batch, signatures):
+            public_key.verify(bytes.fromhex(signature), digest_meter_data(meter_data), padding.PKCS1v15(), hashes.SHA256())
+
+    def test_workers_sign_with_the_key_given_at_creation(self):
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        signer_pool = SignerPool(workers=1, private_key=private_key)
+        self.addCleanup(signer_pool.shutdown)
+        signs, serializations = sum(SIGN_SECONDS.counts), sum(SERIALIZE_SECONDS.counts)
+        signatures = signer_pool.sign_meter_data(self.batch[:3])
+        for meter_data, signature in zip(self.batch, signatures):
+            private_key.public_key().verify(bytes.fromhex(signature), digest_meter_data(meter_data))
+        self.assertEqual(sum(SIGN_SECONDS.counts) - signs, 3)
+        self.assertEqual(sum(SERIALIZE_SECONDS.counts) - serializations, 3)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import json
+import unittest
+import urllib.request
+from unittest.mock import patch
+from ekm_meter.repository.ekm_api import EKMAPIRepository
+from ekm_meter.simulator.meters import MeterSimulator
+from ekm_meter.simulator.server import FaultInjector, SimulatorServer
+
+class TestMeterSimulator(unittest.TestCase):
+    def test_readings_are_deterministic_per_seed(self):
+        first, second = MeterSimulator(seed=7), MeterSimulator(seed=7)
+        self.assertEqual(first.reading("300000001", 1770000000), second.reading("300000001", 1770000000))
+        self.assertNotEqual(first.reading("300000001", 1770000000), MeterSimulator(seed=8).reading("300000001", 1770000000))
+
+    def test_total_watt_hour_never_decreases(self):
+        simulator = MeterSimulator(seed=3)
+        for meter_number in simulator.meter_numbers[:20]:
+            totals = [simulator.reading(meter_number, 1770000000 + minute * 60)["total_watt_hour"] for minute in range(1440)]
+            self.assertEqual(totals, sorted(totals))
+            self.assertGreater(totals[-1], totals[0])
+
+class TestSimulatorServer(unittest.TestCase):
+    def start(self, **faults):
+        server = SimulatorServer(("127.0.0.1", 0), MeterSimulator(seed=1, meter_count=10), FaultInjector(**faults)).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def repository(self, server):
+        with patch("ekm_meter.repository.ekm_api.settings") as settings:
+            settings.EKM_API_URL = server.url
+            settings.EKM_METER_NUMBER = "300000000"
+            settings.EKM_API_KEY = "k"
+            return EKMAPIRepository()
+
+    def test_replies_parse_like_ekm_push(self):
+        server = self.start()
+        repository = self.repository(server)
+        self.assertEqual(repository.fetch_meter_data().meter_name, "300000000")
+        meters = repository.fetch_meters_data(["300000001", "300000002", "999"])
+        self.assertEqual(sorted(meters), ["300000001", "300000002"])
+        with urllib.request.urlopen(f"{server.url}/stats", timeout=5) as response:
+            stats = json.loads(response.read())
+        self.assertEqual((stats["requests"], stats["meters_served"]), (2, 3))
+
+    def test_injected_faults_surface_as_fetch_errors(self):
+        for fault in ("throttle", "server_error", "malformed"):
+            server = self.start(**{f"{fault}_rate": 1.0})
+            with self.assertRaises(RuntimeError):
+                self.repository(server).fetch_meter_data()
+            self.assertEqual(server.stats.snapshot()["faults"], {fault: 1})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import unittest
+import requests
+from ekm_meter.controller.main import _spool_sink
+from ekm_meter.repository.spool import DEAD_LETTER_FILE, DEAD_LETTERS, Spool, SpoolReplayer
+
+class TestSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_spool(self, **kwargs):
+        kwargs.setdefault("segment_max_bytes", 200)
+        return Spool(self.directory, fsync_records=10, fsync_seconds=60, **kwargs)
+
+    def segment_files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.startswith("segment-"))
+
+    def test_append_rotates_and_reads_in_order(self):
+        spool = self.open_spool()
+        seqs = [spool.append({"hashed_data": f"h{n}"}) for n in range(20)]
+        self.assertEqual(seqs, list(range(1, 21)))
+        self.assertGreater(len(self.segment_files()), 1)
+        records = spool.read(5, 3)
+        self.assertEqual(records, [(5, {"hashed_data": "h4"}), (6, {"hashed_data": "h5"}), (7, {"hashed_data": "h6"})])
+        spool.close()
+
+    def test_ack_compacts_sealed_segments_and_survives_reopen(self):
+        spool = self.open_spool()
+        for n in range(20):
+            spool.append({"hashed_data": f"h{n}"})
+        segments = len(self.segment_files())
+        spool.ack(15)
+        self.assertLess(len(self.segment_files()), segments)
+        self.assertEqual(spool.backlog(), 5)
+        spool.close()
+
+        reopened = self.open_spool()
+        self.assertEqual(reopened.backlog(), 5)
+        self.assertEqual(reopened.read(reopened.acked_seq + 1, 100)[0], (16, {"hashed_data": "h15"}))
+        self.assertEqual(reopened.append({"hashed_data": "h20"}), 21)
+        reopened.close()
+
+    def test_recovers_from_torn_frame(self):
+        spool = self.open_spool(segment_max_bytes=1 << 20)
+        spool.append({"hashed_data": "h0"})
+        spool.append({"hashed_data": "h1"})
+        spool.close()
+        path = os.path.join(self.directory, self.segment_files()[-1])
+        with open(path, "ab") as f:
+            f.write(b"\x00\x00\x00\x40partial")
+
+        reopened = self.open_spool(segment_max_bytes=1 << 20)
+        self.assertEqual(reopened.append({"hashed_data": "h2"}), 3)
+        self.assertEqual([record["hashed_data"] for seq, record in reopened.read(1, 10)], ["h0", "h1", "h2"])
+        reopened.close()
+
+class TestSpoolReplayer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = Spool(self.tmp.name, segment_max_bytes=1 << 20, fsync_records=100, fsync_seconds=60)
+        for n in range(10):
+            self.spool.append({"hashed_data": f"h{n}"})
+
+    def tearDown(self):
+        self.spool.close()
+        self.tmp.cleanup()
+
+    def test_drain_acks_delivered_prefix_and_resumes(self):
+        delivered = []
+        outage = {"active": True}
+
+        def sink(records):
+            results = []
+            for record in records:
+                if outage["active"] and record["hashed_data"] == "h6":
+                    break
+                delivered.append(record["hashed_data"])
+                results.append(True)
+            return results
+
+        replayer = SpoolReplayer(self.spool, sink, rate_per_second=0, batch_size=4)
+        self.assertEqual(replayer.drain(), 6)
+        self.assertEqual(self.spool.backlog(), 4)
+
+        outage["active"] = False
+        self.assertEqual(replayer.drain(), 4)
+        self.assertEqual(self.spool.backlog(), 0)
+        self.assertEqual(delivered, [f"h{n}" for n in range(10)])
+
+    def test_drain_stops_when_sink_raises(self):
+        def sink(records):
+            raise RuntimeError("Failed to ingest batch to cloud: 503")
+
+        replayer = SpoolReplayer(self.spool, sink, rate_per_second=0, batch_size=4)
+        self.assertEqual(replayer.drain(), 0)
+        self.assertEqual(self.spool.backlog(), 10)
+
+    def test_drain_dead_letters_rejected_record_and_continues(self):
+        delivered = []
+
+        def sink(records):
+            results = []
+            for record in records:
+                if record["hashed_data"] == "h5":
+                    results.append("invalid signature")
+                    continue
+                delivered.append(record["hashed_data"])
+                results.append(True)
+            return results
+
+        before = DEAD_LETTERS.value
+        replayer = SpoolReplayer(self.spool, sink, rate_per_second=0, batch_size=4)
+        self.assertEqual(replayer.drain(), 10)
+        self.assertEqual(self.spool.backlog(), 0)
+        self.assertEqual(delivered, [f"h{n}" for n in range(10) if n != 5])
+        self.assertEqual(DEAD_LETTERS.value, before + 1)
+        with open(os.path.join(self.tmp.name, DEAD_LETTER_FILE)) as f:
+            dead = [json.loads(line) for line in f]
+        self.assertEqual(dead, [{"seq": 6, "reason": "invalid signature", "record": {"hashed_data": "h5"}}])
+
+    def test_ingest_sink_rejects_client_errors_and_pauses_on_outages(self):
+        class Ingestion:
+            def __init__(self, failures):
+                self.failures = failures
+                self.sent = []
+
+            def ingest(self, record):
+                status = self.failures.get(record["hashed_data"])
+                if status:
+                    response = requests.Response()
+                    response.status_code = status
+                    try:
+                        raise requests.HTTPError(f"{status} Client Error", response=response)
+                    except requests.HTTPError as e:
+                        raise RuntimeError(f"Failed to ingest data to cloud: {e}")
+                self.sent.append(record["hashed_data"])
+
+        ingestion = Ingestion({"h2": 422, "h4": 503})
+        results = _spool_sink(ingestion)([record for seq, record in self.spool.read(1, 10)])
+        self.assertEqual(results[:2], [True, True])
+        self.assertTrue(results[2].startswith("HTTP 422"))
+        self.assertEqual(results[3:], [True])
+        self.assertEqual(ingestion.sent, ["h0", "h1", "h3"])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import unittest
+from ekm_meter.config.settings import Settings, configure, get_settings, settings
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative import time of the controller, in milliseconds; override on slow CI machines
+BUDGET_MS = float(os.getenv("EKM_STARTUP_BUDGET_MS", "500"))
+
+def run_without_configuration(*args):
+    # No EKM_* variables at all: importing must neither fail nor read them
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": REPO_ROOT}
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+
+class TestStartup(unittest.TestCase):
+    def test_controller_import_fits_budget(self):
+        timings = []
+        for _ in range(3):
+            result = run_without_configuration("-X", "importtime", "-c", "import ekm_meter.controller.main")
+            self.assertEqual(result.returncode, 0, result.stderr)
+            line = next(line for line in result.stderr.splitlines() if line.endswith("| ekm_meter.controller.main"))
+            timings.append(int(line.split("|")[1]) / 1000)
+        self.assertLess(min(timings), BUDGET_MS)
+
+    def test_heavy_imports_are_deferred(self):
+        result = run_without_configuration(
+            "-c",
+            "import sys, ekm_meter.controller.main; "
+            "print(','.join(name for name in ('cryptography', 'http.server', 'dotenv') if name in sys.modules))",
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_settings_can_be_injected(self):
+        injected = Settings(environ={
+            "EKM_API_URL": "http://ekm.test",
+            "EKM_METER_NUMBER": "1",
+            "EKM_API_KEY": "k",
+            "CLOUD_INGEST_URL": "http://cloud.test/ingest",
+            "PRIVATE_KEY_PATH": "key.pem",
+        })
+        previous = configure(injected)
+        try:
+            self.assertIs(get_settings(), injected)
+            self.assertEqual(settings.EKM_API_URL, "http://ekm.test")
+            self.assertEqual(settings.CLOUD_INGEST_BATCH_URL, "http://cloud.test/ingest/batch")
+        finally:
+            configure(previous)
+        with self.assertRaises(ValueError):
+            Settings(environ={})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
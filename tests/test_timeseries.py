@@ -0,0 +1,102 @@
+import builtins
+import dataclasses
+import errno
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from ekm_meter.domain.models import MeterData
+from ekm_meter.repository.timeseries import TimeSeriesStore
+
+class TestTimeSeriesStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.template = MeterData(
+            meter_name="TestMeter",
+            meter_data={"kwh": 1.0},
+            meter_day_of_week="Monday",
+            reading_date="2026-02-09T00:00:00Z",
+            model="Pulse v.4",
+            address="123 Main St",
+            firmware="1.0.0",
+            total_watt_hour=1000.0,
+            voltage=120.0,
+            amps=10.0,
+            total_power_watts=1200.0,
+            ct_ratio=1.0,
+            frequency_hz=60.0
+        )
+
+    def reading(self, n):
+        return dataclasses.replace(
+            self.template,
+            meter_data={"kwh": n},
+            reading_date=f"minute {n}",
+            firmware=f"1.0.{n % 3}",
+            address=None if n == 5 else self.template.address,
+            total_watt_hour=1000.0 + n,
+        )
+
+    def test_range_query_round_trips_readings(self):
+        store = TimeSeriesStore(self.tmp.name, flush_rows=7)
+        for n in range(100):
+            store.append("300000001", self.reading(n), timestamp=1_700_000_000 + 60 * n)
+        store.append("300000002", self.reading(0), timestamp=1_700_000_000)
+
+        rows = list(store.query("300000001", 1_700_000_000 + 60 * 4, 1_700_000_000 + 60 * 10))
+        self.assertEqual([timestamp for timestamp, _ in rows], [1_700_000_000 + 60 * n for n in range(4, 10)])
+        self.assertEqual([reading for _, reading in rows], [self.reading(n) for n in range(4, 10)])
+        self.assertEqual(list(store.column("300000001", "total_watt_hour", end=1_700_000_000 + 60 * 3)), [1000.0, 1001.0, 1002.0])
+        self.assertEqual(store.count("300000001"), 100)
+        self.assertEqual(store.meter_numbers(), ["300000001", "300000002"])
+        self.assertEqual(list(store.query("300000003")), [])
+        with self.assertRaises(ValueError):
+            store.append("300000001", self.reading(100), timestamp=1_700_000_000)
+
+    def test_reopen_trims_torn_tail(self):
+        store = TimeSeriesStore(self.tmp.name)
+        for n in range(10):
+            store.append("300000001", self.reading(n), timestamp=1_700_000_000 + n)
+        store.close()
+        # A crash after part of a flush: one column got an extra row, the string table half a line
+        directory = os.path.join(self.tmp.name, "300000001")
+        with open(os.path.join(directory, "voltage.f64"), "ab") as f:
+            f.write(b"\x00" * 8)
+        with open(os.path.join(directory, "strings.jsonl"), "a") as f:
+            f.write('"1.0.')
+
+        reopened = TimeSeriesStore(self.tmp.name)
+        self.assertEqual(reopened.count("300000001"), 10)
+        reopened.append("300000001", self.reading(10), timestamp=1_700_000_010)
+        self.assertEqual([reading for _, reading in reopened.query("300000001")], [self.reading(n) for n in range(11)])
+
+    def test_failed_flush_is_rolled_back(self):
+        store = TimeSeriesStore(self.tmp.name)
+        store.append("300000001", self.reading(0), timestamp=1)
+        real_open = builtins.open
+
+        def disk_full_on_amps(path, *args, **kwargs):
+            if str(path).endswith("amps.f64"):
+                raise OSError(errno.ENOSPC, "No space left on device")
+            return real_open(path, *args, **kwargs)
+
+        with patch("builtins.open", disk_full_on_amps), self.assertRaises(OSError):
+            store.flush()
+        store.flush()
+        store.append("300000001", dataclasses.replace(self.reading(1), voltage=99.0), timestamp=2)
+        self.assertEqual(list(store.timestamps("300000001")), [1000, 2000])
+        self.assertEqual([reading.voltage for _, reading in store.query("300000001")], [120.0, 99.0])
+        store.close()
+        self.assertEqual(TimeSeriesStore(self.tmp.name).count("300000001"), 2)
+
+    def test_clock_stepping_back_does_not_reject_readings(self):
+        store = TimeSeriesStore(self.tmp.name)
+        with patch("ekm_meter.repository.timeseries.time.time", return_value=2000.0):
+            store.append("300000001", self.reading(0))
+        with patch("ekm_meter.repository.timeseries.time.time", return_value=1990.0):
+            store.append("300000001", self.reading(1))
+        self.assertEqual(list(store.timestamps("300000001")), [2_000_000, 2_000_000])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file